@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import JobLock, JobRun, Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'queue', 'status', 'attempts', 'run_at')
+    list_filter = ('queue', 'status')
+    search_fields = ('name', 'key')
+
+
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = ('job', 'started', 'duration', 'success', 'owner')
+    list_filter = ('job', 'success')
+
+
+admin.site.register(Task, TaskAdmin)
+admin.site.register(JobLock)
+admin.site.register(JobRun, JobRunAdmin)
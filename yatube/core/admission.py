@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+
+from .metrics import LOAD_SHED
+from .pagecache import cached_response
+from .ratelimit import SAFE_METHODS
+
+
+class LatencyWindow:
+    """Время запросов к базе за последние ADMISSION_WINDOW секунд.
+
+    Окно общее для всех потоков процесса; без свежих замеров задержка
+    считается нулевой, поэтому перегрузка снимается сама.
+    """
+
+    def __init__(self, maxlen=1000):
+        self.lock = threading.Lock()
+        self.samples = deque(maxlen=maxlen)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add(started, time.monotonic() - started)
+
+    def add(self, stamp, duration):
+        with self.lock:
+            self.samples.append((stamp, duration))
+
+    def latency(self):
+        """Среднее время запроса к базе в окне."""
+        horizon = time.monotonic() - settings.ADMISSION_WINDOW
+        with self.lock:
+            while self.samples and self.samples[0][0] < horizon:
+                self.samples.popleft()
+            if not self.samples:
+                return 0
+            return sum(
+                duration for _, duration in self.samples
+            ) / len(self.samples)
+
+
+db_latency = LatencyWindow()
+
+
+class AdmissionMiddleware:
+    """Пропускает запросы по классам view, сбрасывая нагрузку при перегрузке.
+
+    Запрос изменяющим методом — write, остальные — read; ADMISSION_CLASSES
+    переопределяет класс для отдельных view, ADMISSION_LIMITS задаёт
+    лимиты одновременных запросов. Когда средняя задержка базы выше
+    ADMISSION_DB_LATENCY или класс выбрал свой лимит, первыми отказывают
+    записи: 503 с Retry-After. Чтение в этом случае получает устаревшую
+    копию из кэша страниц, а без неё — 503 только сверх лимита класса.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lock = threading.Lock()
+        self.in_flight = Counter()
+
+    def __call__(self, request):
+        try:
+            with connection.execute_wrapper(db_latency):
+                return self.get_response(request)
+        finally:
+            view_class = getattr(request, 'admission_class', None)
+            if view_class is not None:
+                with self.lock:
+                    self.in_flight[view_class] -= 1
+
+    def view_class(self, request, view_name):
+        default = 'read' if request.method in SAFE_METHODS else 'write'
+        return settings.ADMISSION_CLASSES.get(view_name, default)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        view_class = self.view_class(request, view_name)
+        limit = settings.ADMISSION_LIMITS[view_class]
+        with self.lock:
+            full = self.in_flight[view_class] >= limit
+            if not full:
+                self.in_flight[view_class] += 1
+                request.admission_class = view_class
+        slow = db_latency.latency() > settings.ADMISSION_DB_LATENCY
+        if not (full or slow):
+            return None
+        if view_class == 'read':
+            response = cached_response(request, stale=True)
+            if response is not None:
+                LOAD_SHED.inc(view=view_name, action='stale')
+                return response
+            if not full:
+                return None
+        LOAD_SHED.inc(view=view_name, action='rejected')
+        response = HttpResponse(
+            'Сервер перегружен, попробуйте позже', status=503
+        )
+        response['Retry-After'] = settings.ADMISSION_RETRY_AFTER
+        return response
@@ -1,5 +1,19 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        if settings.MEMORY_TRACKING:
+            from .memory import start_tracing
+            start_tracing()
+        if settings.SLOW_QUERY_THRESHOLD is not None:
+            from django.db.backends.signals import connection_created
+
+            from .slowquery import install_slow_query_logger
+            connection_created.connect(install_slow_query_logger)
+        if not settings.DEBUG:
+            from .warmup import warm_templates
+            warm_templates()
@@ -0,0 +1,162 @@
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+def build_environ(scope, body):
+    """Собирает WSGI environ из HTTP scope спецификации ASGI."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'REMOTE_ADDR': client[0],
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        if name in environ:
+            # HTTP/2 присылает cookie отдельными заголовками, а склеивать
+            # их нужно через «; », а не через запятую.
+            separator = '; ' if name == 'HTTP_COOKIE' else ','
+            value = f'{environ[name]}{separator}{value}'
+        environ[name] = value
+    return environ
+
+
+STREAM_CONTENT_TYPES = (b'text/event-stream',)
+
+
+def is_stream(headers):
+    return any(
+        name == b'content-type' and value.startswith(STREAM_CONTENT_TYPES)
+        for name, value in headers
+    )
+
+
+class WsgiToAsgi:
+    """ASGI-приложение поверх WSGI-приложения Django.
+
+    Соединения обслуживает цикл событий, а блокирующая обработка запроса
+    (ORM, шаблоны, миниатюры) выполняется в пуле из max_workers потоков,
+    так что медленные запросы не держат по потоку на каждое соединение.
+    Долгие потоки событий читаются в отдельном пуле из max_streams
+    потоков и не занимают пул запросов; при отключении клиента поток
+    закрывается после очередного сообщения.
+    """
+
+    def __init__(self, wsgi_application, max_workers, max_streams=1):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='asgi'
+        )
+        self.stream_executor = ThreadPoolExecutor(
+            max_workers=max_streams,
+            thread_name_prefix='asgi-stream'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f'Unsupported scope type: {scope["type"]}')
+        body = await self.read_body(receive)
+        loop = asyncio.get_event_loop()
+        status, headers, result = await loop.run_in_executor(
+            self.executor, self.start, build_environ(scope, body)
+        )
+        chunks = iter(result)
+        executor = self.executor
+        disconnected = None
+        if is_stream(headers):
+            executor = self.stream_executor
+            disconnected = asyncio.ensure_future(receive())
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers,
+        })
+        try:
+            while True:
+                pending = loop.run_in_executor(executor, next, chunks, None)
+                if disconnected is not None:
+                    await asyncio.wait(
+                        {pending, disconnected},
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                chunk = await pending
+                if chunk is None or self.gone(disconnected):
+                    break
+                await send({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': True,
+                })
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if disconnected is not None:
+                disconnected.cancel()
+            close = getattr(result, 'close', None)
+            if close is not None:
+                await loop.run_in_executor(executor, close)
+
+    def gone(self, disconnected):
+        return (
+            disconnected is not None
+            and disconnected.done()
+            and not disconnected.cancelled()
+            and disconnected.result()['type'] == 'http.disconnect'
+        )
+
+    def start(self, environ):
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        result = self.wsgi_application(environ, start_response)
+        return response['status'], response['headers'], result
+
+    async def read_body(self, receive):
+        body = b''
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return body
+            body += message.get('body', b'')
+            if not message.get('more_body', False):
+                return body
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                self.stream_executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,29 @@
+from functools import lru_cache
+
+from django.templatetags.static import static
+from django.urls import reverse
+
+NAV_URLS = {
+    'index': 'posts:index',
+    'follow_index': 'posts:follow_index',
+    'group_index': 'posts:group_index',
+    'post_create': 'posts:post_create',
+    'author': 'about:author',
+    'tech': 'about:tech',
+    'password_reset_form': 'users:password_reset_form',
+    'logout': 'users:logout',
+    'login': 'users:login',
+    'signup': 'users:signup',
+}
+
+
+@lru_cache(maxsize=None)
+def nav_urls():
+    urls = {name: reverse(view) for name, view in NAV_URLS.items()}
+    urls['logo'] = static('img/logo.png')
+    return urls
+
+
+def nav(request):
+    """Добавляет ссылки навигации, вычисленные один раз на процесс."""
+    return {'nav': nav_urls()}
@@ -0,0 +1,74 @@
+import datetime as dt
+import logging
+from importlib import import_module
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import Task
+from .scheduler import periodic
+
+logger = logging.getLogger(__name__)
+
+# Значение PRAGMA auto_vacuum для режима INCREMENTAL.
+INCREMENTAL = 2
+
+
+@periodic
+def sqlite_analyze():
+    """Обновляет статистику SQLite для планировщика запросов."""
+    if connection.vendor != 'sqlite':
+        return 'skipped: not sqlite'
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return 'analyzed'
+
+
+@periodic
+def sqlite_vacuum():
+    """Возвращает системе до SQLITE_VACUUM_PAGES свободных страниц.
+
+    incremental_vacuum работает только в режиме auto_vacuum=INCREMENTAL.
+    Перевод в него — полный VACUUM под эксклюзивной блокировкой, поэтому
+    он делается вручную командой sqlite_incremental_vacuum, а задача без
+    этого режима ничего не делает.
+    """
+    if connection.vendor != 'sqlite':
+        return 'skipped: not sqlite'
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA auto_vacuum')
+        if cursor.fetchone()[0] != INCREMENTAL:
+            logger.warning(
+                'SQLite auto_vacuum is not INCREMENTAL, run '
+                'manage.py sqlite_incremental_vacuum once'
+            )
+            return 'skipped: auto_vacuum is not INCREMENTAL'
+        cursor.execute('PRAGMA freelist_count')
+        free = cursor.fetchone()[0]
+        cursor.execute(
+            f'PRAGMA incremental_vacuum({int(settings.SQLITE_VACUUM_PAGES)})'
+        )
+        cursor.fetchall()
+        cursor.execute('PRAGMA freelist_count')
+        return f'freed pages: {free - cursor.fetchone()[0]}'
+
+
+@periodic
+def clear_sessions():
+    """Удаляет истёкшие сессии, как manage.py clearsessions."""
+    engine = import_module(settings.SESSION_ENGINE)
+    engine.SessionStore.clear_expired()
+
+
+@periodic
+def purge_tasks():
+    """Удаляет завершённые и упавшие задачи старше TASK_RETENTION_DAYS.
+
+    Вместе со строками освобождаются и их ключи идемпотентности.
+    """
+    cutoff = timezone.now() - dt.timedelta(days=settings.TASK_RETENTION_DAYS)
+    deleted, _ = Task.objects.filter(
+        status__in=(Task.DONE, Task.FAILED), finished__lt=cutoff
+    ).delete()
+    return f'purged tasks: {deleted}'
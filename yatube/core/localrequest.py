@@ -0,0 +1,54 @@
+import sys
+from functools import lru_cache
+from io import BytesIO
+from urllib.parse import unquote_to_bytes, urlsplit
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.wsgi import WSGIRequest
+
+
+@lru_cache(maxsize=None)
+def handler():
+    """Обработчик со всеми MIDDLEWARE, как у WSGI-сервера."""
+    base_handler = BaseHandler()
+    base_handler.load_middleware()
+    return base_handler
+
+
+def local_host():
+    """Первое имя из ALLOWED_HOSTS, которым можно подписать запрос."""
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*':
+            return host.lstrip('.')
+    return 'localhost'
+
+
+def local_get(path):
+    """Анонимный GET-запрос к сайту внутри процесса, без сети.
+
+    Запрос проходит через все middleware и проверку хоста. Сигналы
+    request_started и request_finished не отправляются: соединения
+    с базой закрывает вызывающий код.
+    """
+    url = urlsplit(path)
+    host = local_host()
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': unquote_to_bytes(url.path).decode('iso-8859-1'),
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': host,
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    return handler().get_response(WSGIRequest(environ))
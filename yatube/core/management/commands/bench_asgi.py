@@ -0,0 +1,89 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+from yatube.settings import ASGI_MAX_THREADS
+
+from ...asgi import WsgiToAsgi, build_environ
+
+
+def http_scope(path):
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': b'',
+        'headers': [],
+    }
+
+
+def bench_wsgi(application, path, requests, concurrency):
+    """Поток на соединение, как у многопоточного WSGI-сервера."""
+    def call():
+        started = time.perf_counter()
+        result = application(
+            build_environ(http_scope(path), b''), lambda *args: None
+        )
+        b''.join(result)
+        result.close()
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda _: call(), range(requests)))
+
+
+def bench_asgi(application, path, requests, concurrency):
+    async def call(semaphore):
+        async with semaphore:
+            started = time.perf_counter()
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                pass
+
+            await application(http_scope(path), receive, send)
+            return time.perf_counter() - started
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(
+            *(call(semaphore) for _ in range(requests))
+        )
+
+    return asyncio.run(main())
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность WSGI и ASGI точек входа '
+        'при большом числе одновременных запросов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument('--threads', type=int, default=ASGI_MAX_THREADS)
+
+    def handle(self, path, requests, concurrency, threads, **options):
+        wsgi = get_wsgi_application()
+        asgi = WsgiToAsgi(wsgi, max_workers=threads)
+        for name, bench, application in (
+            ('wsgi', bench_wsgi, wsgi),
+            ('asgi', bench_asgi, asgi),
+        ):
+            started = time.perf_counter()
+            latencies = sorted(bench(application, path, requests, concurrency))
+            elapsed = time.perf_counter() - started
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            self.stdout.write(
+                f'{name}: {requests / elapsed:8.1f} req/s, '
+                f'p50 {statistics.median(latencies) * 1000:7.1f} ms, '
+                f'p99 {p99 * 1000:7.1f} ms'
+            )
@@ -0,0 +1,54 @@
+import timeit
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.loader import get_template
+from django.test import RequestFactory
+
+from posts.forms import PostForm
+from posts.models import Group, Post, User
+from yatube.settings import PAGINATOR_COUNT
+
+from ...warmup import project_templates
+
+
+def bench_context():
+    """Контекст из несохранённых объектов: замеряется только шаблон."""
+    author = User(pk=1, username='bench', first_name='Bench')
+    group = Group(pk=1, title='bench', slug='bench')
+    post = Post(pk=1, text='bench ' * 50, author=author, group=group)
+    posts = [post] * PAGINATOR_COUNT * 3
+    form = PostForm()
+    form.fields['group'].queryset = Group.objects.none()
+    return {
+        'page_obj': Paginator(posts, PAGINATOR_COUNT).page(2),
+        'group': group,
+        'profile': author,
+        'post': post,
+        'post_count': len(posts),
+        'posts_count': len(posts),
+        'comments': [],
+        'form': form,
+        'index': True,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время отрисовки каждого шаблона из templates/posts/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=200)
+
+    def handle(self, number, **options):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        context = bench_context()
+        for name in project_templates('posts'):
+            template = get_template(name)
+            seconds = timeit.timeit(
+                lambda: template.render(context, request), number=number
+            )
+            self.stdout.write(
+                f'{name:<40} {seconds / number * 1000:8.3f} ms'
+            )
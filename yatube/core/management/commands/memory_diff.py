@@ -0,0 +1,32 @@
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from ...memory import snapshot_diff, top_sites
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает два снимка tracemalloc из /debug/memory?snapshot= '
+        'или показывает главные места аллокаций одного снимка.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('snapshots', nargs='+', metavar='snapshot')
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument(
+            '--group-by', choices=('lineno', 'filename', 'traceback'),
+            default='lineno'
+        )
+
+    def handle(self, snapshots, top, group_by, **options):
+        loaded = [tracemalloc.Snapshot.load(path) for path in snapshots]
+        if len(loaded) == 1:
+            statistics = top_sites(loaded[0], top, group_by)
+        else:
+            statistics = snapshot_diff(loaded[0], loaded[-1], top, group_by)
+        for statistic in statistics:
+            self.stdout.write(str(statistic))
+            if group_by == 'traceback':
+                for line in statistic.traceback.format():
+                    self.stdout.write(f'  {line}')
@@ -0,0 +1,122 @@
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+STARTUP_SCRIPT = '''
+import json
+import sys
+import time
+
+from django.apps import AppConfig
+
+ready_times = {}
+create = AppConfig.create.__func__
+
+
+def timed_create(cls, entry):
+    config = create(cls, entry)
+    ready = config.ready
+
+    def timed_ready():
+        started = time.perf_counter()
+        ready()
+        ready_times[config.label] = time.perf_counter() - started
+
+    config.ready = timed_ready
+    return config
+
+
+AppConfig.create = classmethod(timed_create)
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+get_wsgi_application()
+get_resolver().url_patterns
+print(json.dumps({
+    'total': time.perf_counter() - started,
+    'ready': ready_times,
+    'modules': sorted(sys.modules),
+}))
+'''
+
+
+def parse_importtime(output):
+    """Строки `-X importtime` -> {модуль: (собственное, суммарное) мкс}."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        if not own.strip().isdigit():
+            continue
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+def profile_startup():
+    """Запускает чистый процесс воркера и собирает время импорта и ready."""
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.splitlines()[-1])
+    report['imports'] = parse_importtime(result.stderr)
+    return report
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает, сколько стоит холодный старт воркера: время импорта '
+        'модулей и пакетов, время ready() каждого приложения и тяжёлые '
+        'модули, загруженные при старте.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20)
+
+    def handle(self, top, **options):
+        report = profile_startup()
+        imports = report['imports']
+        packages = Counter()
+        for name, (own, _) in imports.items():
+            packages[name.split('.')[0]] += own
+
+        self.stdout.write(f'Старт воркера: {report["total"] * 1000:.1f} ms')
+        self.stdout.write('\nПакеты (собственное время импорта):')
+        for name, own in packages.most_common(top):
+            self.stdout.write(f'  {own / 1000:9.1f} ms  {name}')
+        self.stdout.write('\nМодули (суммарное время импорта):')
+        slowest = sorted(
+            imports.items(), key=lambda item: item[1][1], reverse=True
+        )
+        for name, (_, cumulative) in slowest[:top]:
+            self.stdout.write(f'  {cumulative / 1000:9.1f} ms  {name}')
+        self.stdout.write('\nready() приложений:')
+        for label, seconds in sorted(
+            report['ready'].items(), key=lambda item: item[1], reverse=True
+        ):
+            self.stdout.write(f'  {seconds * 1000:9.1f} ms  {label}')
+        heavy = [
+            name for name in settings.STARTUP_HEAVY_MODULES
+            if name in report['modules']
+        ]
+        if heavy:
+            self.stdout.write(self.style.WARNING(
+                f'\nЗагружены при старте: {", ".join(heavy)}'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                '\nТяжёлые модули при старте не загружаются'
+            ))
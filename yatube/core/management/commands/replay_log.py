@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from ...replay import (Replay, authenticated_clients, parse_log,
+                       session_cookies)
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+class Command(BaseCommand):
+    help = (
+        'Воспроизводит журнал доступа против локального экземпляра и '
+        'сравнивает задержки и статусы по маршрутам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('logs', nargs='+', metavar='access.log')
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument(
+            '--speed', type=float, default=1,
+            help='Ускорение относительно журнала; 0 — без пауз.'
+        )
+        parser.add_argument(
+            '--include-writes', action='store_true',
+            help='Повторять и POST: тел запросов в журнале нет, поэтому '
+                 'они проверяют только CSRF и права.'
+        )
+        parser.add_argument(
+            '--user-prefix', default='replay',
+            help='Префикс имён пользователей для залогиненных клиентов.'
+        )
+
+    def handle(self, logs, base_url, concurrency, speed, include_writes,
+               user_prefix, **options):
+        entries = []
+        for path in logs:
+            with open(path, encoding='utf-8', errors='replace') as log:
+                entries.extend(parse_log(log))
+        replayed = [
+            entry for entry in entries
+            if include_writes or entry.method in READ_METHODS
+        ]
+        clients = authenticated_clients(entries)
+        cookies = session_cookies(clients, user_prefix)
+        self.stdout.write(
+            f'Запросов: {len(replayed)} из {len(entries)}, '
+            f'залогиненных клиентов: {len(clients)}'
+        )
+        replay = Replay(base_url, concurrency, speed, cookies).run(replayed)
+        for line in replay.report():
+            self.stdout.write(line)
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from yatube.settings import SCHEDULER_TICK
+
+from ...models import JobRun
+from ...scheduler import load_jobs, node_name, run_due
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает периодические задачи SCHEDULED_JOBS. Можно держать '
+        'на нескольких узлах: каждую задачу выполнит только один.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить задачи, чьё время пришло, и выйти.'
+        )
+        parser.add_argument(
+            '--history', type=int, metavar='N',
+            help='Показать последние N запусков и выйти.'
+        )
+
+    def handle(self, once, history, **options):
+        if history:
+            for run in JobRun.objects.all()[:history]:
+                status = 'ok' if run.success else 'ошибка'
+                self.stdout.write(
+                    f'{run.started:%Y-%m-%d %H:%M:%S} {run.job} {status} '
+                    f'{run.duration:.3f}s {run.owner} '
+                    f'{run.result.splitlines()[-1] if run.result else ""}'
+                )
+            return
+        load_jobs()
+        owner = node_name()
+        while True:
+            close_old_connections()
+            for run in run_due(owner):
+                status = 'ok' if run.success else 'ошибка'
+                self.stdout.write(
+                    f'{run.job}: {status} за {run.duration:.3f}s'
+                )
+            if once:
+                return
+            time.sleep(SCHEDULER_TICK)
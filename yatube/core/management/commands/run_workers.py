@@ -0,0 +1,56 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...tasks import Worker, load_tasks, run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет задачи фоновой очереди: по TASK_QUEUES потоков '
+        'на каждую очередь. Пока команда не запущена, задачи (в том числе '
+        'письма сброса пароля) только копятся, если TASKS_EAGER = False.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue', action='append', dest='queues',
+            help='Обрабатывать только эту очередь (можно несколько раз).'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти.'
+        )
+
+    def handle(self, queues, once, **options):
+        names = sorted(load_tasks())
+        queues = queues or list(settings.TASK_QUEUES)
+        unknown = set(queues) - set(settings.TASK_QUEUES)
+        if unknown:
+            raise CommandError(f'Нет таких очередей: {", ".join(unknown)}')
+        if once:
+            for queue in queues:
+                done = run_pending(queue)
+                self.stdout.write(f'{queue}: выполнено задач {done}')
+            return
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *args: stop.set())
+        workers = [
+            Worker(queue, stop, settings.TASK_POLL_INTERVAL)
+            for queue in queues
+            for _ in range(settings.TASK_QUEUES[queue])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(
+            f'Запущено потоков: {len(workers)}, задач: {len(names)}'
+        )
+        try:
+            while not stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            stop.set()
+        for worker in workers:
+            worker.join()
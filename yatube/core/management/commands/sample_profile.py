@@ -0,0 +1,62 @@
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+
+class Command(BaseCommand):
+    help = (
+        'Снимает стеки всех потоков запущенного процесса через '
+        '/debug/profile: --seconds секунд с частотой --rate. Доступ — по '
+        'PROFILER_TOKEN. Каждый запрос попадает в один процесс, поэтому '
+        'при нескольких воркерах профилируется тот, что его принял.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url', default='http://127.0.0.1:8000',
+            help='Адрес запущенного сайта.'
+        )
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--rate', type=float, default=None)
+        parser.add_argument(
+            '--views-only', action='store_true',
+            help='Только потоки, которые обрабатывают запрос.'
+        )
+        parser.add_argument(
+            '--format', choices=('collapsed', 'speedscope'),
+            default='collapsed'
+        )
+        parser.add_argument(
+            '--output', help='Файл для профиля; по умолчанию stdout.'
+        )
+
+    def handle(self, base_url, seconds, rate, views_only, format, output,
+               **options):
+        params = {
+            'seconds': seconds,
+            'rate': rate or settings.PROFILER_RATE,
+            'format': format,
+        }
+        if views_only:
+            params['views_only'] = 1
+        headers = {}
+        if settings.PROFILER_TOKEN:
+            headers['Authorization'] = f'Bearer {settings.PROFILER_TOKEN}'
+        try:
+            response = requests.get(
+                base_url.rstrip('/') + reverse('profiler'), params=params,
+                headers=headers, timeout=seconds + 30
+            )
+        except requests.RequestException as error:
+            raise CommandError(f'Профиль не получен: {error}')
+        if response.status_code != 200:
+            raise CommandError(
+                f'Профиль не получен: {response.status_code} {response.text}'
+            )
+        if output:
+            with open(output, 'w') as file:
+                file.write(response.text)
+            self.stderr.write(f'Профиль записан в {output}')
+        else:
+            self.stdout.write(response.text, ending='')
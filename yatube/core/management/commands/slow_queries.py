@@ -0,0 +1,67 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from ...querybudget import normalize
+from ...slowquery import journal_files
+
+
+def summarize(entries, view_prefix=''):
+    """Группирует записи журнала по нормализованному SQL."""
+    summary = {}
+    for entry in entries:
+        if not (entry['view'] or '').startswith(view_prefix):
+            continue
+        sql = normalize(entry['sql'])
+        item = summary.setdefault(sql, {
+            'sql': sql,
+            'count': 0,
+            'total': 0,
+            'max': 0,
+            'views': set(),
+            'frames': set(),
+            'plan': entry['plan'],
+        })
+        item['count'] += 1
+        item['total'] += entry['duration']
+        item['max'] = max(item['max'], entry['duration'])
+        item['views'].add(entry['view'] or '-')
+        if entry['frame']:
+            item['frames'].add(entry['frame'])
+    return sorted(
+        summary.values(), key=lambda item: item['total'], reverse=True
+    )
+
+
+class Command(BaseCommand):
+    help = 'Сводка журнала медленных запросов SLOW_QUERY_LOG.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument(
+            '--view', default='posts:',
+            help='Учитывать только view с этим префиксом имени.'
+        )
+
+    def handle(self, top, view, **options):
+        files = journal_files()
+        if not files:
+            self.stdout.write('Медленных запросов не записано')
+            return
+        entries = []
+        for path in files:
+            with open(path, encoding='utf-8') as log:
+                entries.extend(
+                    json.loads(line) for line in log if line.strip()
+                )
+        for item in summarize(entries, view)[:top]:
+            self.stdout.write(
+                f'{item["count"]} x, всего {item["total"]:.3f}s, '
+                f'макс. {item["max"]:.3f}s, '
+                f'view: {", ".join(sorted(item["views"]))}'
+            )
+            self.stdout.write(f'  {item["sql"]}')
+            for frame in sorted(item['frames']):
+                self.stdout.write(f'  из {frame}')
+            for line in item['plan'] or ():
+                self.stdout.write(f'  план: {line}')
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ...jobs import INCREMENTAL
+
+
+class Command(BaseCommand):
+    help = (
+        'Переводит базу SQLite в режим auto_vacuum=INCREMENTAL, нужный '
+        'задаче sqlite_vacuum. Выполняет полный VACUUM: база переписывается '
+        'целиком и на это время блокируется, запускайте в окно обслуживания.'
+    )
+
+    def handle(self, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда только для SQLite')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA auto_vacuum')
+            if cursor.fetchone()[0] == INCREMENTAL:
+                self.stdout.write('База уже в режиме INCREMENTAL')
+                return
+            cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            cursor.execute('VACUUM')
+        self.stdout.write(self.style.SUCCESS('База переведена в INCREMENTAL'))
@@ -0,0 +1,144 @@
+import os
+import threading
+import tracemalloc
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+view_stats = defaultdict(lambda: {'requests': 0, 'peak': 0, 'retained': 0})
+_lock = threading.Lock()
+
+
+def start_tracing():
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(settings.MEMORY_TRACE_FRAMES)
+
+
+class MemoryMiddleware:
+    """Приписывает пик и прирост памяти запроса его view.
+
+    Работает, только пока включён tracemalloc (MEMORY_TRACKING). Пик
+    tracemalloc общий на процесс, поэтому при нескольких потоках пик
+    запроса включает и соседние запросы. До Python 3.9 пик сбросить
+    нельзя, и вместо него берётся память в конце запроса.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not tracemalloc.is_tracing():
+            return self.get_response(request)
+        before = tracemalloc.get_traced_memory()[0]
+        can_reset_peak = hasattr(tracemalloc, 'reset_peak')
+        if can_reset_peak:
+            tracemalloc.reset_peak()
+        response = self.get_response(request)
+        current, peak = tracemalloc.get_traced_memory()
+        if not can_reset_peak:
+            peak = current
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        with _lock:
+            stats = view_stats[view_name]
+            stats['requests'] += 1
+            stats['peak'] = max(stats['peak'], peak - before)
+            stats['retained'] += current - before
+        return response
+
+
+def take_snapshot(label):
+    """Сохраняет снимок tracemalloc в MEMORY_SNAPSHOT_DIR; путь к файлу."""
+    os.makedirs(settings.MEMORY_SNAPSHOT_DIR, exist_ok=True)
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(
+        settings.MEMORY_SNAPSHOT_DIR, f'{os.getpid()}-{stamp}-{label}.dump'
+    )
+    tracemalloc.take_snapshot().dump(path)
+    return path
+
+
+def clean_snapshot(snapshot):
+    return snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ))
+
+
+def top_sites(snapshot, limit, group_by='lineno'):
+    return clean_snapshot(snapshot).statistics(group_by)[:limit]
+
+
+def snapshot_diff(old, new, limit, group_by='lineno'):
+    return clean_snapshot(new).compare_to(
+        clean_snapshot(old), group_by
+    )[:limit]
+
+
+def cache_entry_sizes(alias='default'):
+    """Размер каждой записи LocMemCache в байтах, от больших к меньшим.
+
+    LocMemCache хранит значения уже сериализованными через pickle, так
+    что это и есть занятая ими память. Записи копируются под блокировкой
+    кэша: иначе параллельная запись ломает обход. Другие бэкенды не
+    поддерживаются.
+    """
+    backend = caches[alias]
+    store = getattr(backend, '_cache', None)
+    if store is None:
+        return []
+    with backend._lock:
+        items = list(store.items())
+    return sorted(
+        ((key, len(value)) for key, value in items),
+        key=lambda item: item[1],
+        reverse=True
+    )
+
+
+def format_size(size):
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f'{size:.0f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GiB'
+
+
+def memory_report(limit=20):
+    """Текстовый отчёт: память процесса, view, места аллокаций и кэш."""
+    lines = []
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        lines.append(
+            f'traced: {format_size(current)}, peak: {format_size(peak)}'
+        )
+        lines.append('')
+        lines.append('views (requests, max peak, retained total):')
+        with _lock:
+            stats = sorted(
+                view_stats.items(),
+                key=lambda item: item[1]['peak'],
+                reverse=True
+            )
+        for view_name, item in stats:
+            lines.append(
+                f'  {view_name}: {item["requests"]}, '
+                f'{format_size(item["peak"])}, '
+                f'{format_size(item["retained"])}'
+            )
+        lines.append('')
+        lines.append('top allocation sites:')
+        for statistic in top_sites(tracemalloc.take_snapshot(), limit):
+            lines.append(f'  {statistic}')
+    else:
+        lines.append(
+            'tracemalloc is off, set MEMORY_TRACKING=1 in the environment'
+        )
+    for alias in settings.CACHES:
+        lines.append('')
+        lines.append(f'cache entries ({alias}):')
+        for key, size in cache_entry_sizes(alias)[:limit]:
+            lines.append(f'  {key}: {format_size(size)}')
+    return '\n'.join(lines) + '\n'
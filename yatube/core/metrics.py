@@ -0,0 +1,301 @@
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+INITIAL_SIZE = 1 << 16
+HEADER = struct.Struct('i')
+VALUE = struct.Struct('d')
+
+
+def entry_size(key_length):
+    """Длина записи: 4 байта длины ключа, ключ, выравнивание, float64."""
+    padding = (8 - (HEADER.size + key_length) % 8) % 8
+    return HEADER.size + key_length + padding + VALUE.size
+
+
+def read_entries(data):
+    """Разбирает содержимое файла метрик в пары (ключ, значение)."""
+    used = HEADER.unpack_from(data, 0)[0]
+    position = 8
+    while position < used:
+        length = HEADER.unpack_from(data, position)[0]
+        start = position + HEADER.size
+        key = data[start:start + length].decode('utf-8')
+        position += entry_size(length)
+        yield key, VALUE.unpack_from(data, position - VALUE.size)[0]
+
+
+class MmapValues:
+    """Значения метрик одного процесса в memory-mapped файле.
+
+    Пишет только процесс-владелец, поэтому между процессами блокировки
+    не нужны; читатели просто разбирают файлы всех процессов.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'a+b')
+        size = os.fstat(self.file.fileno()).st_size
+        if size == 0:
+            self.file.truncate(INITIAL_SIZE)
+            size = INITIAL_SIZE
+        self.capacity = size
+        self.mmap = mmap.mmap(self.file.fileno(), self.capacity)
+        if HEADER.unpack_from(self.mmap, 0)[0] == 0:
+            HEADER.pack_into(self.mmap, 0, 8)
+        self.used = HEADER.unpack_from(self.mmap, 0)[0]
+        self.positions = {}
+        position = 8
+        for key, _ in read_entries(self.mmap):
+            position += entry_size(len(key.encode('utf-8')))
+            self.positions[key] = position - VALUE.size
+
+    def add(self, key, amount):
+        position = self.positions.get(key)
+        if position is None:
+            position = self.append(key)
+        value = VALUE.unpack_from(self.mmap, position)[0]
+        VALUE.pack_into(self.mmap, position, value + amount)
+
+    def append(self, key):
+        encoded = key.encode('utf-8')
+        size = entry_size(len(encoded))
+        while self.used + size > self.capacity:
+            self.capacity *= 2
+            self.file.truncate(self.capacity)
+            self.mmap.close()
+            self.mmap = mmap.mmap(self.file.fileno(), self.capacity)
+        start = self.used
+        HEADER.pack_into(self.mmap, start, len(encoded))
+        self.mmap[start + HEADER.size:start + HEADER.size + len(encoded)] = (
+            encoded
+        )
+        position = start + size - VALUE.size
+        VALUE.pack_into(self.mmap, position, 0.0)
+        self.used += size
+        HEADER.pack_into(self.mmap, 0, self.used)
+        self.positions[key] = position
+        return position
+
+
+class Registry:
+    """Метрики процесса и их сборка по файлам всех процессов."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.values = None
+        self.path = None
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+
+    def add(self, key, amount):
+        path = os.path.join(
+            settings.METRICS_DIR, f'metrics_{os.getpid()}.db'
+        )
+        with self.lock:
+            if path != self.path:
+                os.makedirs(settings.METRICS_DIR, exist_ok=True)
+                self.values = MmapValues(path)
+                self.path = path
+            self.values.add(key, amount)
+
+    def collect(self):
+        """Суммирует значения всех процессов; gauge — только живых."""
+        totals = defaultdict(float)
+        pattern = os.path.join(settings.METRICS_DIR, 'metrics_*.db')
+        for path in glob.glob(pattern):
+            pid = int(os.path.basename(path)[len('metrics_'):-len('.db')])
+            alive = pid_alive(pid)
+            with open(path, 'rb') as file:
+                data = file.read()
+            if len(data) < 8:
+                continue
+            for key, value in read_entries(data):
+                name = json.loads(key)[0]
+                metric = self.metrics.get(name)
+                if metric is None or (metric.kind == 'gauge' and not alive):
+                    continue
+                totals[key] += value
+        return totals
+
+    def render(self):
+        samples = defaultdict(list)
+        for key, value in self.collect().items():
+            name, suffix, labels = json.loads(key)
+            samples[name].append((suffix, labels, value))
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            lines.extend(metric.render(samples[name]))
+        return '\n'.join(lines) + '\n'
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def escape_label(value):
+    """Экранирует значение метки, как требует текстовый формат Prometheus."""
+    return (
+        str(value).replace('\\', '\\\\').replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        f'{name}="{escape_label(value)}"' for name, value in labels
+    )
+    return f'{{{pairs}}}'
+
+
+def format_value(value):
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.registry = registry
+        self.keys = {}
+        registry.register(self)
+
+    def key(self, suffix, labels):
+        labels = tuple(sorted(labels.items()))
+        key = self.keys.get((suffix, labels))
+        if key is None:
+            key = json.dumps([self.name, suffix, labels], ensure_ascii=False)
+            self.keys[(suffix, labels)] = key
+        return key
+
+    def render(self, samples):
+        for _, labels, value in sorted(samples):
+            yield f'{self.name}{format_labels(labels)} {format_value(value)}'
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        self.registry.add(self.key('', labels), amount)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        self.registry.add(self.key('', labels), amount)
+
+    def dec(self, amount=1, **labels):
+        self.registry.add(self.key('', labels), -amount)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, buckets, registry=REGISTRY):
+        super().__init__(name, documentation, registry)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        for bound in self.buckets:
+            if value <= bound:
+                self.registry.add(self.key(repr(float(bound)), labels), 1)
+                break
+        self.registry.add(self.key('sum', labels), value)
+        self.registry.add(self.key('count', labels), 1)
+
+    def render(self, samples):
+        series = defaultdict(dict)
+        for suffix, labels, value in samples:
+            series[tuple(map(tuple, labels))][suffix] = value
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound in self.buckets:
+                cumulative += values.get(repr(float(bound)), 0)
+                bucket_labels = labels + (('le', repr(float(bound))),)
+                yield (
+                    f'{self.name}_bucket{format_labels(bucket_labels)} '
+                    f'{format_value(cumulative)}'
+                )
+            count = values.get('count', 0)
+            inf_labels = labels + (('le', '+Inf'),)
+            yield (
+                f'{self.name}_bucket{format_labels(inf_labels)} '
+                f'{format_value(count)}'
+            )
+            yield (
+                f'{self.name}_sum{format_labels(labels)} '
+                f'{format_value(values.get("sum", 0))}'
+            )
+            yield (
+                f'{self.name}_count{format_labels(labels)} '
+                f'{format_value(count)}'
+            )
+
+
+REQUEST_DURATION = Histogram(
+    'yatube_request_duration_seconds',
+    'Время обработки запроса по имени view.',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    'yatube_request_queries',
+    'Число запросов к базе на один HTTP-запрос по имени view.',
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55),
+)
+CACHE_REQUESTS = Counter(
+    'yatube_cache_requests_total',
+    'Обращения к кэшам лент, групп и пользователей: hit или miss.',
+)
+THUMBNAIL_DURATION = Histogram(
+    'yatube_thumbnail_duration_seconds',
+    'Время создания миниатюры.',
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+THUMBNAILS_IN_PROGRESS = Gauge(
+    'yatube_thumbnails_in_progress',
+    'Миниатюры, которые создаются прямо сейчас (очередь на создание).',
+)
+RATE_LIMITED = Counter(
+    'yatube_rate_limited_total',
+    'Запросы, отклонённые ограничением частоты, по имени view.',
+)
+LOAD_SHED = Counter(
+    'yatube_load_shed_total',
+    'Запросы, сброшенные при перегрузке: stale из кэша или rejected.',
+)
+STALE_PAGES = Counter(
+    'yatube_stale_pages_total',
+    'Страницы, отданные из последней удачной копии при ошибке базы.',
+)
+
+
+def cache_result(cache_name, hits=0, misses=0):
+    if hits:
+        CACHE_REQUESTS.inc(hits, cache=cache_name, result='hit')
+    if misses:
+        CACHE_REQUESTS.inc(misses, cache=cache_name, result='miss')
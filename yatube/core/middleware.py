@@ -0,0 +1,66 @@
+import threading
+import time
+
+from django.db import connection
+
+from .metrics import REQUEST_DURATION, REQUEST_QUERIES
+
+_current = threading.local()
+_views_by_thread = {}
+
+
+def current_view_name():
+    """Имя view запроса, который обрабатывает текущий поток, или None."""
+    return getattr(_current, 'view_name', None)
+
+
+def running_views():
+    """Имена view, которые сейчас выполняются, по id потока."""
+    return dict(_views_by_thread)
+
+
+class ViewNameMiddleware:
+    """Запоминает имя view текущего запроса для журналов и метрик."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            _current.view_name = None
+            _views_by_thread.pop(threading.get_ident(), None)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _current.view_name = request.resolver_match.view_name
+        _views_by_thread[threading.get_ident()] = _current.view_name
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Пишет в метрики время ответа и число запросов к базе по view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        REQUEST_DURATION.observe(
+            time.perf_counter() - started, view=view_name
+        )
+        REQUEST_QUERIES.observe(queries.count, view=view_name)
+        return response
@@ -0,0 +1,42 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:56
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobLock',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('owner', models.CharField(blank=True, max_length=200)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('next_run', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.CharField(max_length=100)),
+                ('owner', models.CharField(max_length=200)),
+                ('started', models.DateTimeField()),
+                ('duration', models.FloatField()),
+                ('success', models.BooleanField()),
+                ('result', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ('-started',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='jobrun',
+            index=models.Index(fields=['job', 'started'], name='core_jobrun_job_0e98cd_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Задача фоновой очереди, которую выполняет run_workers."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=200)
+    queue = models.CharField(max_length=50, default='default')
+    arguments = models.TextField(default='{}')
+    key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(
+        max_length=10, choices=STATUSES, default=QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('run_at',)
+        indexes = (models.Index(fields=('queue', 'status', 'run_at')),)
+
+    def __str__(self):
+        return f'{self.name} [{self.status}]'
+
+
+class JobLock(models.Model):
+    """Строка-блокировка периодической задачи планировщика.
+
+    Задачу запускает тот узел, которому удалось условным UPDATE занять
+    строку; next_run хранит время следующего запуска.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    owner = models.CharField(max_length=200, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    next_run = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.name
+
+
+class JobRun(models.Model):
+    """Запись о запуске периодической задачи."""
+    job = models.CharField(max_length=100)
+    owner = models.CharField(max_length=200)
+    started = models.DateTimeField()
+    duration = models.FloatField()
+    success = models.BooleanField()
+    result = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ('-started',)
+        indexes = (models.Index(fields=('job', 'started')),)
+
+    def __str__(self):
+        return f'{self.job} {self.started:%Y-%m-%d %H:%M}'
@@ -0,0 +1,259 @@
+import hashlib
+import logging
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, OperationalError
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+
+from .metrics import STALE_PAGES, cache_result
+from .singleflight import flights
+from .stale import refresher
+
+logger = logging.getLogger(__name__)
+
+HOLE = re.compile(
+    r'<!--hole:(?P<name>[\w./-]+)-->.*?<!--/hole-->', re.DOTALL
+)
+
+
+def hole(name, content):
+    """Оборачивает фрагмент, зависящий от пользователя, в метки."""
+    return f'<!--hole:{name}-->{content}<!--/hole-->'
+
+
+def punch_holes(content, request):
+    """Перерисовывает фрагменты-дырки кэшированной страницы для request."""
+    return HOLE.sub(
+        lambda match: hole(
+            match['name'], render_to_string(match['name'], request=request)
+        ),
+        content
+    )
+
+
+def page_cache():
+    return caches[settings.PAGE_CACHE]
+
+
+def stale_page_cache():
+    return caches[settings.STALE_PAGE_CACHE]
+
+
+def page_number(request):
+    """Номер страницы пагинатора так, как его поймёт Paginator.get_page."""
+    number = request.GET.get('page', '')
+    return str(int(number)) if number.isdigit() else '1'
+
+
+def page_key(request):
+    """Ключ страницы: путь и номер страницы пагинатора.
+
+    Других параметров закэшированные view не читают, поэтому они в ключ
+    не входят: иначе каждый ?x=N заводил бы новую запись.
+    """
+    url = f'{request.path}?page={page_number(request)}'
+    return f'page:{hashlib.md5(url.encode("utf-8")).hexdigest()}'
+
+
+def tag_key(tag):
+    return f'page_tag:{tag}'
+
+
+def depend_on(request, *tags):
+    """Отмечает данные, с изменением которых страница устаревает.
+
+    Теги вида 'post:1', 'user:2', 'group:3' и 'posts' для новых постов;
+    сбрасывает их invalidate_pages. Страница без тегов не кэшируется.
+    """
+    if not hasattr(request, 'page_tags'):
+        request.page_tags = set()
+    request.page_tags.update(tags)
+
+
+def post_tags(posts):
+    tags = set()
+    for post in posts:
+        tags.add(f'post:{post.pk}')
+        tags.add(f'user:{post.author_id}')
+    return tags
+
+
+def invalidate_pages(*tags):
+    page_cache().delete_many([tag_key(tag) for tag in tags])
+
+
+def tag_versions(tags):
+    """Текущие версии тегов; недостающие создаются заново."""
+    cache = page_cache()
+    keys = [tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+            versions[key] = version
+    return versions
+
+
+def is_fresh(entry):
+    versions = page_cache().get_many(list(entry['tags']))
+    return versions == entry['tags']
+
+
+def page_audience(request):
+    """'anonymous' или 'shared', если страницу можно взять из кэша."""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    view_name = request.resolver_match.view_name
+    if view_name not in settings.PAGE_CACHE_VIEWS:
+        return None
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return 'anonymous'
+    if view_name in settings.PAGE_CACHE_SHARED_VIEWS:
+        return 'shared'
+    return None
+
+
+def last_good_key(key):
+    return f'last_good:{key}'
+
+
+def entry_response(request, entry, state, punch):
+    content = entry['content']
+    if punch:
+        try:
+            content = punch_holes(content, request)
+        except DatabaseError:
+            logger.warning('Holes of stale page %s left as cached',
+                           request.path)
+    response = HttpResponse(content, content_type=entry['content_type'])
+    response['X-Page-Cache'] = state
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def cached_response(request, stale=False):
+    """Ответ из кэша страниц.
+
+    Со stale годится и устаревшая копия, но не старше
+    ADMISSION_STALE_MAX_AGE секунд: её отдают вместо чтения при
+    перегрузке, а после удаления или правки поста долго показывать
+    старую версию нельзя.
+    """
+    audience = page_audience(request)
+    if audience is None:
+        return None
+    entry = page_cache().get(page_key(request))
+    if entry is None:
+        return None
+    fresh = is_fresh(entry)
+    if not fresh:
+        age = time.time() - entry.get('stored', 0)
+        if not stale or age > settings.ADMISSION_STALE_MAX_AGE:
+            return None
+    cache_result('page', hits=1)
+    return entry_response(
+        request, entry, 'hit' if fresh else 'stale', audience == 'shared'
+    )
+
+
+def last_good_response(request):
+    """Последняя удачная версия страницы для любого пользователя."""
+    if request.resolver_match.view_name not in settings.PAGE_CACHE_VIEWS:
+        return None
+    entry = stale_page_cache().get(last_good_key(page_key(request)))
+    if entry is None:
+        return None
+    response = entry_response(
+        request, entry, 'stale',
+        settings.SESSION_COOKIE_NAME in request.COOKIES
+    )
+    response['Warning'] = '111 - "Revalidation Failed"'
+    return response
+
+
+class PageCacheMiddleware:
+    """Кэш страниц для запросов без cookie сессии.
+
+    Страницы из PAGE_CACHE_VIEWS хранятся по URL вместе с версиями своих
+    тегов и устаревают, как только меняется один из тегов. Страницы из
+    PAGE_CACHE_SHARED_VIEWS отдаются и вошедшим пользователям: у копии
+    перерисовываются только фрагменты-дырки вроде шапки.
+
+    Одинаковые анонимные запросы к ещё не закэшированной странице
+    объединяются: страницу рисует один, остальные ждут её в кэше.
+
+    Если view падает с OperationalError, отдаётся последняя удачная
+    версия страницы, а фоновый поток перерисует её, когда база оживёт.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+            if getattr(request, 'page_cache_store', False):
+                self.store(request, response)
+            return response
+        finally:
+            if getattr(request, 'page_flight', None):
+                flights.done(request.page_flight)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        audience = page_audience(request)
+        if audience is None:
+            return None
+        response = cached_response(request)
+        if response is not None:
+            return response
+        anonymous = audience == 'anonymous'
+        if anonymous:
+            key = page_key(request)
+            if flights.lead(key):
+                request.page_flight = key
+            elif flights.wait(key):
+                response = cached_response(request)
+                if response is not None:
+                    response['X-Page-Cache'] = 'coalesced'
+                    return response
+        cache_result('page', misses=1)
+        request.page_cache_store = anonymous
+        return None
+
+    def store(self, request, response):
+        tags = getattr(request, 'page_tags', None)
+        if (not tags or response.status_code != 200 or response.streaming
+                or response.cookies):
+            return
+        key = page_key(request)
+        entry = {
+            'content': response.content.decode(response.charset),
+            'content_type': response['Content-Type'],
+            'tags': tag_versions(tags),
+            'stored': time.time(),
+        }
+        page_cache().set(key, entry, settings.PAGE_CACHE_TIMEOUT)
+        stale_page_cache().set(last_good_key(key), entry,
+                               settings.STALE_PAGE_TIMEOUT)
+
+    def process_exception(self, request, exception):
+        """При недоступной базе отдаёт последнюю удачную версию страницы."""
+        if not isinstance(exception, OperationalError):
+            return None
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        response = last_good_response(request)
+        if response is None:
+            return None
+        logger.warning('Serving stale %s: %s', request.path, exception)
+        STALE_PAGES.inc(view=request.resolver_match.view_name)
+        refresher.schedule(request.get_full_path())
+        return response
@@ -0,0 +1,84 @@
+import logging
+import re
+from collections import Counter
+from contextlib import ContextDecorator
+
+from django.conf import settings
+from django.db import connections, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+logger = logging.getLogger(__name__)
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def normalize(sql):
+    return LITERALS.sub('?', sql)
+
+
+def budget_report(queries, budget, label):
+    """Текст об overrun с повторяющимися (после нормализации) запросами."""
+    repeated = Counter(normalize(query['sql']) for query in queries)
+    lines = [f'{label}: {len(queries)} queries, budget {budget}']
+    for sql, count in repeated.most_common():
+        if count < 2:
+            break
+        lines.append(f'  {count} x {sql}')
+    return '\n'.join(lines)
+
+
+class query_budget(ContextDecorator):
+    """Падает, если внутри блока выполнено больше budget запросов.
+
+    Работает как контекстный менеджер и как декоратор::
+
+        with query_budget(4):
+            client.get('/')
+    """
+
+    def __init__(self, budget, using='default', label='block'):
+        self.budget = budget
+        self.label = label
+        self.context = CaptureQueriesContext(connections[using])
+
+    def __enter__(self):
+        self.context.__enter__()
+        return self.context
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None and len(self.context) > self.budget:
+            raise QueryBudgetExceeded(
+                budget_report(self.context.captured_queries, self.budget,
+                              self.label)
+            )
+
+
+class QueryBudgetMiddleware:
+    """В DEBUG проверяет число запросов view по settings.QUERY_BUDGETS.
+
+    Превышение пишется в лог с повторяющимися запросами, а при
+    QUERY_BUDGET_STRICT = True поднимает QueryBudgetExceeded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DEBUG:
+            return self.get_response(request)
+        reset_queries()
+        response = self.get_response(request)
+        match = request.resolver_match
+        budget = match and settings.QUERY_BUDGETS.get(match.view_name)
+        queries = connections['default'].queries
+        if budget is not None and len(queries) > budget:
+            report = budget_report(queries, budget, match.view_name)
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(report)
+            logger.warning(report)
+        return response
@@ -0,0 +1,90 @@
+import math
+import time
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from .metrics import RATE_LIMITED
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+def parse_rate(rate):
+    """'30/m' -> (токенов в секунду, ёмкость корзины)."""
+    count, period = rate.split('/')
+    count = int(count)
+    return count / PERIODS[period], count
+
+
+class TokenBucket:
+    """Корзины токенов в кэше; ключ — имя view и пользователь или IP.
+
+    Отметки времени — time.time(): кэш общий для процессов и машин, а
+    time.monotonic() у каждой машины отсчитывается от своей загрузки.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def take(self, key, rate, capacity):
+        """Забирает токен; возвращает 0 или через сколько секунд повторить."""
+        now = time.time()
+        tokens, stamp = self.cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - stamp) * rate)
+        retry_after = 0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self.cache.set(key, (tokens, now), int(capacity / rate) + 1)
+        return retry_after
+
+
+class RateLimitMiddleware:
+    """Ограничивает частоту запросов к view из settings.RATE_LIMITS.
+
+    Ограничиваются только изменяющие запросы: показ формы (GET) не
+    тратит токены. View из RATE_LIMIT_ANY_METHOD меняют данные по
+    GET-ссылке, поэтому у них считается любой запрос. Проверка делается
+    в process_view, до того как view обратится к базе; пользователь
+    определяется по id из сессии, без загрузки из auth_user.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limits = {
+            view_name: parse_rate(rate)
+            for view_name, rate in settings.RATE_LIMITS.items()
+        }
+        self.any_method = set(settings.RATE_LIMIT_ANY_METHOD)
+        self.buckets = TokenBucket(caches[settings.RATE_LIMIT_CACHE])
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        if (request.method in SAFE_METHODS
+                and view_name not in self.any_method):
+            return None
+        limit = self.limits.get(view_name)
+        if limit is None:
+            return None
+        user_id = request.session.get(SESSION_KEY)
+        if user_id is not None:
+            client = f'user:{user_id}'
+        else:
+            client = f'ip:{request.META.get("REMOTE_ADDR", "")}'
+        retry_after = self.buckets.take(
+            f'ratelimit:{view_name}:{client}', *limit
+        )
+        if not retry_after:
+            return None
+        RATE_LIMITED.inc(view=view_name)
+        response = HttpResponse('Слишком много запросов', status=429)
+        response['Retry-After'] = math.ceil(retry_after)
+        return response
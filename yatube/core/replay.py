@@ -0,0 +1,194 @@
+import datetime as dt
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY, get_user_model)
+from django.urls import Resolver404, resolve
+
+# Combined Log Format nginx и Apache; common без двух последних полей.
+LOG_LINE = re.compile(
+    r'(?P<host>\S+) \S+ (?P<user>\S+) \[(?P<time>[^\]]+)\] '
+    r'"(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" (?P<status>\d{3}) \S+'
+    r'(?: "[^"]*" "(?P<agent>[^"]*)")?'
+)
+TIME_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+LOGIN_REQUIRED_VIEWS = {
+    'posts:post_create',
+    'posts:post_edit',
+    'posts:add_comment',
+    'posts:follow_index',
+    'posts:profile_follow',
+    'posts:profile_unfollow',
+}
+
+
+class LogEntry:
+    def __init__(self, time, client, method, path, status, remote_user):
+        self.time = time
+        self.client = client
+        self.method = method
+        self.path = path
+        self.status = status
+        self.remote_user = remote_user
+        self.route = route_name(path)
+
+
+def route_name(path):
+    try:
+        return resolve(urlsplit(path).path).view_name
+    except Resolver404:
+        return 'unresolved'
+
+
+def parse_log(lines):
+    """Разбирает строки журнала доступа; нераспознанные пропускает.
+
+    Клиент — это пользователь из журнала, а если его нет — пара
+    IP и User-Agent.
+    """
+    for line in lines:
+        match = LOG_LINE.match(line)
+        if match is None:
+            continue
+        remote_user = match['user'] if match['user'] != '-' else None
+        yield LogEntry(
+            time=dt.datetime.strptime(match['time'], TIME_FORMAT),
+            client=remote_user or f'{match["host"]} {match["agent"] or ""}',
+            method=match['method'],
+            path=match['path'],
+            status=int(match['status']),
+            remote_user=remote_user,
+        )
+
+
+def authenticated_clients(entries):
+    """Клиенты, которые в журнале были залогинены.
+
+    Это клиенты с пользователем в журнале и те, кто получал страницы,
+    доступные только после входа, без перенаправления на логин.
+    """
+    return {
+        entry.client for entry in entries
+        if entry.remote_user
+        or (entry.route in LOGIN_REQUIRED_VIEWS and entry.status == 200)
+    }
+
+
+def session_cookies(clients, prefix='replay'):
+    """Создаёт по пользователю на клиента и открывает для него сессию."""
+    User = get_user_model()
+    engine = import_module(settings.SESSION_ENGINE)
+    backend = settings.AUTHENTICATION_BACKENDS[0]
+    cookies = {}
+    for number, client in enumerate(sorted(clients), 1):
+        user, _ = User.objects.get_or_create(username=f'{prefix}_{number}')
+        session = engine.SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = backend
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        cookies[client] = {settings.SESSION_COOKIE_NAME: session.session_key}
+    return cookies
+
+
+def percentile(values, fraction):
+    """Перцентиль по ближайшему рангу."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Replay:
+    """Воспроизводит запросы журнала против base_url.
+
+    Запросы отправляются в исходном темпе, ускоренном в speed раз
+    (speed=0 — без пауз), не более чем concurrency одновременно.
+    """
+
+    def __init__(self, base_url, concurrency, speed, cookies=None,
+                 timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.speed = speed
+        self.cookies = cookies or {}
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.deviations = Counter()
+        self.errors = Counter()
+        self.lag = 0
+
+    def send(self, entry, due=None):
+        if due is not None:
+            with self.lock:
+                self.lag = max(self.lag, time.monotonic() - due)
+        started = time.perf_counter()
+        try:
+            response = requests.request(
+                entry.method,
+                self.base_url + entry.path,
+                cookies=self.cookies.get(entry.client),
+                allow_redirects=False,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as error:
+            with self.lock:
+                self.errors[entry.route, type(error).__name__] += 1
+            return
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.latencies[entry.route].append(elapsed)
+            if response.status_code != entry.status:
+                self.deviations[
+                    entry.route, entry.status, response.status_code
+                ] += 1
+
+    def run(self, entries):
+        entries = sorted(entries, key=lambda entry: entry.time)
+        if not entries:
+            return self
+        first = entries[0].time
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for entry in entries:
+                due = None
+                if self.speed:
+                    due = started + (
+                        entry.time - first
+                    ).total_seconds() / self.speed
+                    delay = due - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                executor.submit(self.send, entry, due)
+        return self
+
+    def report(self):
+        """Строки отчёта: задержки по маршрутам и расхождения статусов."""
+        lines = ['route: count, p50, p90, p99, max (ms)']
+        for route, values in sorted(self.latencies.items()):
+            lines.append(
+                f'  {route}: {len(values)}, '
+                + ', '.join(
+                    f'{percentile(values, fraction) * 1000:.1f}'
+                    for fraction in (0.5, 0.9, 0.99, 1)
+                )
+            )
+        if self.deviations:
+            lines.append('status deviations (route: original -> replay):')
+            for (route, original, replayed), count in sorted(
+                self.deviations.items()
+            ):
+                lines.append(f'  {route}: {original} -> {replayed} x{count}')
+        for (route, error), count in sorted(self.errors.items()):
+            lines.append(f'  error {route}: {error} x{count}')
+        if self.speed:
+            lines.append(f'max schedule lag: {self.lag:.3f}s')
+        return lines
@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from .middleware import running_views
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+
+def frame_label(code):
+    path = os.path.relpath(code.co_filename, settings.BASE_DIR)
+    if path.startswith('..'):
+        path = code.co_filename.rsplit('site-packages/', 1)[-1]
+    return f'{code.co_name} ({path}:{code.co_firstlineno})'
+
+
+def thread_stack(frame):
+    stack = []
+    while frame is not None:
+        stack.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def sample_stacks(seconds, rate, views_only=False, stop=None):
+    """Снимает стеки всех потоков процесса rate раз в секунду.
+
+    Каждый стек помечается именем view, которое выполняет поток, а поток
+    без запроса — своим именем. Сбор идёт seconds секунд или до stop.
+    Возвращает Counter по (метка, стек).
+    """
+    interval = 1 / rate
+    sampler = threading.get_ident()
+    names = {}
+    samples = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if stop is not None and stop.is_set():
+            break
+        views = running_views()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == sampler:
+                continue
+            tag = views.get(thread_id)
+            if tag is None:
+                if views_only:
+                    continue
+                if thread_id not in names:
+                    names = {
+                        thread.ident: thread.name
+                        for thread in threading.enumerate()
+                    }
+                tag = f'thread:{names.get(thread_id, thread_id)}'
+            samples[tag, thread_stack(frame)] += 1
+        time.sleep(interval)
+    return samples
+
+
+def collapsed(samples):
+    """Свёрнутые стеки для flamegraph.pl и speedscope: «a;b;c N»."""
+    return ''.join(
+        f'{";".join((tag,) + stack)} {count}\n'
+        for (tag, stack), count in sorted(samples.items())
+    )
+
+
+def speedscope(samples, rate):
+    """Профиль в формате speedscope: по одному профилю на метку."""
+    frames = []
+    indexes = {}
+    profiles = {}
+    for (tag, stack), count in sorted(samples.items()):
+        sample = []
+        for label in stack:
+            if label not in indexes:
+                indexes[label] = len(frames)
+                frames.append({'name': label})
+            sample.append(indexes[label])
+        profile = profiles.setdefault(tag, {
+            'type': 'sampled',
+            'name': tag,
+            'unit': 'seconds',
+            'startValue': 0,
+            'endValue': 0,
+            'samples': [],
+            'weights': [],
+        })
+        profile['samples'].append(sample)
+        profile['weights'].append(count / rate)
+        profile['endValue'] += count / rate
+    return json.dumps({
+        '$schema': SPEEDSCOPE_SCHEMA,
+        'shared': {'frames': frames},
+        'profiles': list(profiles.values()),
+        'name': 'yatube',
+        'exporter': 'yatube core.sampling',
+    })
@@ -0,0 +1,103 @@
+import datetime as dt
+import logging
+import os
+import socket
+import time
+import traceback
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import JobLock, JobRun
+
+logger = logging.getLogger(__name__)
+
+jobs = {}
+
+
+def periodic(func):
+    """Регистрирует периодическую задачу; интервал задаёт SCHEDULED_JOBS."""
+    jobs[func.__name__] = func
+    return func
+
+
+def load_jobs():
+    autodiscover_modules('jobs')
+    return jobs
+
+
+def node_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def acquire(name, owner, now):
+    """Занимает строку задачи, если её время пришло и она не занята.
+
+    Строку меняет условный UPDATE, поэтому из нескольких узлов задачу
+    получит ровно один. Блокировка упавшего узла истекает сама через
+    SCHEDULER_LOCK_TIMEOUT.
+    """
+    try:
+        with transaction.atomic():
+            JobLock.objects.get_or_create(
+                name=name, defaults={'next_run': now}
+            )
+    except IntegrityError:
+        pass
+    free = Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    return bool(JobLock.objects.filter(
+        free, name=name, next_run__lte=now
+    ).update(
+        owner=owner,
+        locked_until=now + dt.timedelta(
+            seconds=settings.SCHEDULER_LOCK_TIMEOUT
+        ),
+    ))
+
+
+def release(name, owner, next_run):
+    JobLock.objects.filter(name=name, owner=owner).update(
+        locked_until=None, next_run=next_run
+    )
+
+
+def run_job(name, owner):
+    """Выполняет задачу и записывает запуск в историю JobRun."""
+    started = timezone.now()
+    start = time.perf_counter()
+    try:
+        result = jobs[name]()
+    except Exception:
+        logger.exception('Periodic job %s failed', name)
+        success, result = False, traceback.format_exc()
+    else:
+        success = True
+    return JobRun.objects.create(
+        job=name,
+        owner=owner,
+        started=started,
+        duration=time.perf_counter() - start,
+        success=success,
+        result='' if result is None else str(result),
+    )
+
+
+def run_due(owner=None, now=None):
+    """Запускает задачи из SCHEDULED_JOBS, чьё время пришло."""
+    owner = owner or node_name()
+    runs = []
+    for name, interval in settings.SCHEDULED_JOBS.items():
+        if name not in jobs:
+            logger.warning('Periodic job %s is not registered', name)
+            continue
+        started = now or timezone.now()
+        if not acquire(name, owner, started):
+            continue
+        try:
+            runs.append(run_job(name, owner))
+        finally:
+            release(name, owner, started + dt.timedelta(seconds=interval))
+    return runs
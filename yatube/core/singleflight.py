@@ -0,0 +1,61 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class SingleFlight:
+    """Объединяет одинаковые одновременные запросы вокруг одного ведущего.
+
+    Ведущий — первый, кто занял ключ: в своём процессе через словарь
+    событий, а через cache.add в кэше PAGE_CACHE — во всех процессах,
+    которые делят этот кэш. С LocMemCache запросы объединяются только
+    внутри процесса. Остальные ждут, пока ведущий закончит, но не дольше
+    timeout; затем каждый работает сам.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+
+    def cache(self):
+        return caches[settings.PAGE_CACHE]
+
+    def flight_key(self, key):
+        return f'flight:{key}'
+
+    def lead(self, key):
+        with self.lock:
+            if key in self.flights:
+                return False
+            if not self.cache().add(
+                self.flight_key(key), True, settings.SINGLE_FLIGHT_TIMEOUT
+            ):
+                return False
+            self.flights[key] = threading.Event()
+            return True
+
+    def wait(self, key):
+        """Ждёт ведущего; False, если он не успел за SINGLE_FLIGHT_TIMEOUT."""
+        timeout = settings.SINGLE_FLIGHT_TIMEOUT
+        with self.lock:
+            event = self.flights.get(key)
+        if event is not None:
+            return event.wait(timeout)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.cache().get(self.flight_key(key)) is None:
+                return True
+            time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL)
+        return False
+
+    def done(self, key):
+        with self.lock:
+            event = self.flights.pop(key, None)
+        self.cache().delete(self.flight_key(key))
+        if event is not None:
+            event.set()
+
+
+flights = SingleFlight()
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.utils import timezone
+
+from .middleware import current_view_name
+
+logger = logging.getLogger(__name__)
+
+THIS_FILE = os.path.abspath(__file__)
+
+# Записи журнала — отдельный логгер: строки JSON без префиксов в файл
+# SLOW_QUERY_LOG с ротацией по размеру.
+journal = logging.getLogger(f'{__name__}.journal')
+journal.setLevel(logging.INFO)
+journal.propagate = False
+
+
+def journal_files():
+    """Файлы журнала от старых к новым, включая ротированные."""
+    path = settings.SLOW_QUERY_LOG
+    names = [
+        f'{path}.{number}'
+        for number in range(settings.SLOW_QUERY_LOG_BACKUPS, 0, -1)
+    ] + [path]
+    return [name for name in names if os.path.exists(name)]
+
+
+def journal_handler():
+    """Обработчик журнала для текущего SLOW_QUERY_LOG.
+
+    Файл открывается заново, если сменились настройки или файл удалили.
+    """
+    path = settings.SLOW_QUERY_LOG
+    for handler in journal.handlers:
+        if (handler.baseFilename == os.path.abspath(path)
+                and handler.maxBytes == settings.SLOW_QUERY_LOG_MAX_BYTES
+                and handler.backupCount == settings.SLOW_QUERY_LOG_BACKUPS
+                and (handler.stream is None or os.path.exists(path))):
+            return handler
+        journal.removeHandler(handler)
+        handler.close()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    handler = RotatingFileHandler(
+        path,
+        maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+        encoding='utf-8',
+        delay=True
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    journal.addHandler(handler)
+    return handler
+
+
+def origin_frame():
+    """Ближайший к запросу кадр стека из кода проекта."""
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(settings.BASE_DIR) and filename != THIS_FILE:
+            return f'{filename}:{frame.lineno} in {frame.name}'
+    return None
+
+
+class SlowQueryLogger:
+    """execute_wrapper, записывающий запросы дольше SLOW_QUERY_THRESHOLD.
+
+    Записываются только успешные запросы. Для SELECT в SQLite к записи
+    добавляется EXPLAIN QUERY PLAN. Записи пишутся строками JSON в
+    SLOW_QUERY_LOG с ротацией; сводку показывает команда slow_queries.
+    Ошибка записи только логируется и не мешает самому запросу.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+        if duration >= settings.SLOW_QUERY_THRESHOLD:
+            try:
+                self.record(sql, params, many, context, duration)
+            except Exception:
+                logger.exception('Slow query was not recorded')
+        return result
+
+    def explain(self, connection, sql, params):
+        """План запроса через курсор драйвера.
+
+        Мимо execute_wrappers и журнала запросов: EXPLAIN не попадает
+        в метрики, бюджеты запросов и задержку базы для допуска.
+        """
+        if connection.vendor != 'sqlite':
+            return None
+        if not sql.lstrip().upper().startswith('SELECT'):
+            return None
+        try:
+            with connection.cursor() as cursor:
+                cursor.cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                return [row[-1] for row in cursor.cursor.fetchall()]
+        except Exception:
+            return None
+
+    def record(self, sql, params, many, context, duration):
+        entry = {
+            'time': timezone.now().isoformat(),
+            'duration': duration,
+            'sql': sql,
+            'params': None if many else [str(param) for param in params or ()],
+            'view': current_view_name(),
+            'frame': origin_frame(),
+            'plan': None if many else self.explain(
+                context['connection'], sql, params
+            ),
+        }
+        logger.warning(
+            'Slow query %.3fs in %s: %s', duration, entry['view'], sql
+        )
+        with self.lock:
+            journal_handler()
+        journal.info(json.dumps(entry, ensure_ascii=False))
+
+
+slow_query_logger = SlowQueryLogger()
+
+
+def install_slow_query_logger(sender, connection, **kwargs):
+    if slow_query_logger not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_logger)
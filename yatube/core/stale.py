@@ -0,0 +1,79 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection, connections
+
+from .localrequest import local_get
+
+logger = logging.getLogger(__name__)
+
+
+def db_available():
+    """Проверяет, что база снова отвечает на чтение."""
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('SELECT count(*) FROM sqlite_master')
+            else:
+                cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except DatabaseError:
+        return False
+    return True
+
+
+class StaleRefresher:
+    """Перерисовывает отданные устаревшими страницы, когда база оживёт.
+
+    Фоновый поток раз в STALE_REFRESH_INTERVAL секунд проверяет базу и,
+    как только она доступна, запрашивает накопленные адреса анонимным
+    запросом внутри процесса: кэш страниц сохранит свежие копии.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.paths = set()
+        self.thread = None
+
+    def schedule(self, path):
+        with self.lock:
+            self.paths.add(path)
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name='stale-refresher', daemon=True
+                )
+                self.thread.start()
+
+    def refresh(self):
+        """Перерисовывает накопленные страницы; False, если база ещё лежит."""
+        if not db_available():
+            return False
+        with self.lock:
+            paths, self.paths = self.paths, set()
+        for path in sorted(paths):
+            try:
+                local_get(path)
+            except Exception:
+                logger.exception('Refresh of stale page %s failed', path)
+        return True
+
+    def run(self):
+        try:
+            while True:
+                time.sleep(settings.STALE_REFRESH_INTERVAL)
+                if self.refresh():
+                    with self.lock:
+                        if not self.paths:
+                            self.thread = None
+                            return
+        except Exception:
+            logger.exception('Stale page refresher stopped')
+            with self.lock:
+                self.thread = None
+        finally:
+            connections.close_all()
+
+
+refresher = StaleRefresher()
@@ -0,0 +1,110 @@
+import gzip
+import mimetypes
+import os
+from functools import lru_cache
+
+from django.conf import settings
+import brotli
+from django.contrib.staticfiles.storage import (ManifestStaticFilesStorage,
+                                                staticfiles_storage)
+from django.core.files.base import ContentFile
+
+# Кодировки в порядке предпочтения и суффиксы их файлов.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def compress_gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+COMPRESSORS = (('.gz', compress_gzip), ('.br', compress_brotli))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хешами в именах и сжатые копии файлов.
+
+    После collectstatic рядом с каждым файлом из STATIC_COMPRESS_EXTENSIONS
+    лежат .gz и .br — когда они меньше исходника. Пока манифеста нет
+    (collectstatic не запускали, в тестах), файлы отдаются по исходному
+    имени; с манифестом неизвестное имя — ошибка, как у Django.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name, hashed_name in self.hashed_files.items():
+            for path in {name, hashed_name}:
+                for compressed in self.compress(path):
+                    yield path, compressed, True
+
+    def compress(self, name):
+        """Пишет сжатые копии файла; имена записанных копий."""
+        extension = os.path.splitext(name)[1].lower()
+        if extension not in settings.STATIC_COMPRESS_EXTENSIONS:
+            return []
+        with self.open(name) as file:
+            data = file.read()
+        written = []
+        for suffix, compress in COMPRESSORS:
+            compressed = compress(data)
+            if len(compressed) >= len(data):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            written.append(self._save(name + suffix, ContentFile(compressed)))
+        return written
+
+
+@lru_cache(maxsize=None)
+def hashed_names():
+    """Имена с хешем из манифеста: их содержимое никогда не меняется."""
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding с ненулевым q."""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    if '*' in accepted:
+        accepted.update(coding for coding, _ in ENCODINGS)
+    return accepted
+
+
+def negotiate(fullpath, accept_encoding):
+    """Выбирает файл для отдачи.
+
+    Возвращает путь, Content-Encoding (или None) и есть ли у файла
+    сжатые копии — тогда ответ зависит от Accept-Encoding.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    variants = False
+    for coding, suffix in ENCODINGS:
+        if os.path.isfile(fullpath + suffix):
+            variants = True
+            if coding in accepted:
+                return fullpath + suffix, coding, True
+    return fullpath, None, variants
+
+
+def content_type(path):
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
@@ -0,0 +1,165 @@
+import datetime as dt
+import json
+import logging
+import threading
+import traceback
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+class BackgroundTask:
+    """Функция, которую можно поставить в очередь через enqueue."""
+
+    def __init__(self, func, queue, max_attempts):
+        self.func = func
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.name = f'{func.__module__}.{func.__name__}'
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, key=None, delay=0, **kwargs):
+        """Ставит вызов в очередь; с уже занятым key ничего не делает.
+
+        Аргументы сохраняются в JSON, поэтому передавать нужно id и
+        строки, а не объекты моделей.
+        """
+        if settings.TASKS_EAGER:
+            self.func(*args, **kwargs)
+            return None
+        task = Task(
+            name=self.name,
+            queue=self.queue,
+            arguments=json.dumps({'args': args, 'kwargs': kwargs}),
+            key=key,
+            max_attempts=self.max_attempts,
+            run_at=timezone.now() + dt.timedelta(seconds=delay),
+        )
+        try:
+            with transaction.atomic():
+                task.save()
+        except IntegrityError:
+            if key is None:
+                raise
+            return None
+        return task
+
+
+def task(queue='default', max_attempts=5):
+    def decorator(func):
+        background_task = BackgroundTask(func, queue, max_attempts)
+        registry[background_task.name] = background_task
+        return background_task
+    return decorator
+
+
+def retry_delay(attempts):
+    return settings.TASK_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def claim(queue):
+    """Забирает одну готовую задачу очереди или возвращает None.
+
+    Задача считается своей, только если условный UPDATE изменил строку,
+    поэтому два воркера, даже в разных процессах, не получат одну задачу.
+    Задачи упавшего воркера снова становятся доступны после locked_until.
+    """
+    now = timezone.now()
+    ready = Q(status=Task.QUEUED, run_at__lte=now) | Q(
+        status=Task.RUNNING, locked_until__lt=now
+    )
+    candidates = Task.objects.filter(ready, queue=queue).values_list(
+        'pk', 'attempts'
+    )[:10]
+    for pk, attempts in candidates:
+        claimed = Task.objects.filter(ready, pk=pk, attempts=attempts).update(
+            status=Task.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_until=now + dt.timedelta(seconds=settings.TASK_TIMEOUT),
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def execute(task):
+    """Выполняет задачу и записывает результат; ошибка ведёт к повтору.
+
+    У выполненной задачи аргументы стираются, чтобы в таблице не
+    оставались адреса и прочие личные данные.
+    """
+    try:
+        background_task = registry[task.name]
+        arguments = json.loads(task.arguments)
+        background_task.func(*arguments['args'], **arguments['kwargs'])
+    except Exception:
+        logger.exception('Task %s (%s) failed', task.pk, task.name)
+        task.error = traceback.format_exc()
+        if task.attempts < task.max_attempts:
+            task.status = Task.QUEUED
+            task.run_at = timezone.now() + dt.timedelta(
+                seconds=retry_delay(task.attempts)
+            )
+        else:
+            task.status = Task.FAILED
+            task.finished = timezone.now()
+    else:
+        task.status = Task.DONE
+        task.error = ''
+        task.arguments = '{}'
+        task.finished = timezone.now()
+    task.locked_until = None
+    task.save(update_fields=(
+        'status', 'error', 'arguments', 'run_at', 'locked_until', 'finished'
+    ))
+    return task.status
+
+
+def run_pending(queue, limit=None):
+    """Выполняет готовые задачи очереди в текущем потоке."""
+    done = 0
+    while limit is None or done < limit:
+        task = claim(queue)
+        if task is None:
+            break
+        execute(task)
+        done += 1
+    return done
+
+
+class Worker(threading.Thread):
+    """Поток, который разбирает одну очередь, пока не выставлен stop."""
+
+    def __init__(self, queue, stop, poll_interval):
+        super().__init__(name=f'tasks-{queue}', daemon=True)
+        self.queue = queue
+        self.stop = stop
+        self.poll_interval = poll_interval
+
+    def run(self):
+        while not self.stop.is_set():
+            close_old_connections()
+            try:
+                done = run_pending(self.queue, limit=100)
+            except Exception:
+                logger.exception('Worker for queue %s failed', self.queue)
+                done = 0
+            if not done:
+                self.stop.wait(self.poll_interval)
+        close_old_connections()
+
+
+def load_tasks():
+    autodiscover_modules('tasks')
+    return registry
@@ -0,0 +1,16 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from ..pagecache import hole as hole_markers
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name):
+    """Как include, но кэш страниц перерисует фрагмент для пользователя.
+
+    Шаблон фрагмента должен зависеть только от контекста запроса.
+    """
+    content = context.template.engine.get_template(name).render(context)
+    return mark_safe(hole_markers(name, content))
@@ -0,0 +1,118 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.admission import LatencyWindow, db_latency
+from core.pagecache import page_cache, page_key, stale_page_cache
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class LatencyWindowTests(TestCase):
+    def test_old_samples_leave_the_window(self):
+        window = LatencyWindow()
+        with self.settings(ADMISSION_WINDOW=10):
+            window.add(time.monotonic() - 60, 5)
+            window.add(time.monotonic(), 0.2)
+            window.add(time.monotonic(), 0.4)
+            self.assertAlmostEqual(window.latency(), 0.3)
+        self.assertEqual(LatencyWindow().latency(), 0)
+
+
+class AdmissionMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test-user')
+        cls.group = Group.objects.create(
+            title='test-title', slug='test-slug', description='test'
+        )
+        cls.post = Post.objects.create(
+            text='test-text', author=cls.user, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        page_cache().clear()
+        stale_page_cache().clear()
+        db_latency.samples.clear()
+        self.addCleanup(db_latency.samples.clear)
+        self.group_url = reverse('posts:group_list', args=[self.group.slug])
+
+    def overload_db(self):
+        db_latency.add(time.monotonic(), 10)
+
+    def test_writes_are_rejected_when_db_is_slow(self):
+        self.client.force_login(self.user)
+        self.overload_db()
+        response = self.client.post(
+            reverse('posts:add_comment', args=[self.post.pk]),
+            {'text': 'comment'}
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '5')
+        self.assertFalse(Comment.objects.exists())
+
+    def test_class_follows_the_method(self):
+        self.client.force_login(self.user)
+        self.overload_db()
+        self.assertEqual(
+            self.client.get(reverse('posts:post_create')).status_code, 200
+        )
+        response = self.client.post(
+            reverse('users:login'),
+            {'username': 'reader', 'password': 'x'}
+        )
+        self.assertEqual(response.status_code, 503)
+
+    def test_reads_get_stale_page_when_db_is_slow(self):
+        self.client.get(self.group_url)
+        Post.objects.create(
+            text='fresh-text', author=self.user, group=self.group
+        )
+        self.overload_db()
+        with self.assertNumQueries(0):
+            response = self.client.get(self.group_url)
+        self.assertEqual(response['X-Page-Cache'], 'stale')
+        self.assertNotContains(response, 'fresh-text')
+
+    def test_old_stale_page_is_not_served_when_db_is_slow(self):
+        self.client.get(self.group_url)
+        Post.objects.filter(pk=self.post.pk).delete()
+        self.overload_db()
+        later = time.time() + 61
+        with mock.patch('core.pagecache.time.time', return_value=later):
+            response = self.client.get(self.group_url)
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertNotContains(response, 'test-text')
+
+    def test_last_good_copy_is_not_served_when_db_is_slow(self):
+        response = self.client.get(self.group_url)
+        page_cache().delete(page_key(response.wsgi_request))
+        Post.objects.filter(pk=self.post.pk).delete()
+        self.overload_db()
+        response = self.client.get(self.group_url)
+        self.assertNotContains(response, 'test-text')
+
+    def test_reads_without_cached_copy_still_run_when_db_is_slow(self):
+        self.overload_db()
+        response = self.client.get(self.group_url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_reads_over_class_limit_are_rejected(self):
+        with self.settings(ADMISSION_LIMITS={'read': 0, 'write': 0}):
+            response = self.client.get(self.group_url)
+        self.assertEqual(response.status_code, 503)
+
+    def test_requests_pass_without_overload(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('posts:add_comment', args=[self.post.pk]),
+            {'text': 'comment'}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Comment.objects.exists())
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+
+from django.core.wsgi import get_wsgi_application
+from django.test import SimpleTestCase
+
+from core.asgi import WsgiToAsgi, build_environ
+
+
+class WsgiToAsgiTests(SimpleTestCase):
+    def call(self, scope, body=b''):
+        application = WsgiToAsgi(get_wsgi_application(), max_workers=2)
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': body}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(application(scope, receive, send))
+        return messages
+
+    def test_get_request_is_served(self):
+        messages = self.call({
+            'type': 'http',
+            'method': 'GET',
+            'path': '/about/author/',
+            'query_string': b'',
+            'headers': [(b'host', b'localhost')],
+        })
+        self.assertEqual(messages[0]['type'], 'http.response.start')
+        self.assertEqual(messages[0]['status'], 200)
+        body = b''.join(message.get('body', b'') for message in messages[1:])
+        self.assertIn('Об авторе'.encode(), body)
+        self.assertFalse(messages[-1].get('more_body', False))
+
+    def test_event_stream_uses_own_pool_and_stops_on_disconnect(self):
+        threads = []
+        closed = threading.Event()
+
+        def events():
+            try:
+                for number in range(100):
+                    threads.append(threading.current_thread().name)
+                    yield f'data: {number}\n\n'.encode()
+                    closed.wait(0.01)
+            finally:
+                closed.set()
+
+        def wsgi_application(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/event-stream')])
+            return events()
+
+        application = WsgiToAsgi(wsgi_application, max_workers=1)
+        messages = []
+        received = []
+
+        async def receive():
+            received.append(True)
+            if len(received) == 1:
+                return {'type': 'http.request', 'body': b''}
+            await asyncio.sleep(0.05)
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(application(
+            {'type': 'http', 'method': 'GET', 'path': '/events/'},
+            receive,
+            send
+        ))
+        self.assertTrue(closed.is_set())
+        self.assertLess(len(threads), 100)
+        self.assertTrue(
+            all(name.startswith('asgi-stream') for name in threads)
+        )
+
+    def test_build_environ_maps_headers(self):
+        environ = build_environ(
+            {
+                'type': 'http',
+                'method': 'POST',
+                'path': '/create/',
+                'query_string': b'page=2',
+                'headers': [
+                    (b'content-type', b'text/plain'),
+                    (b'x-forwarded-for', b'10.0.0.1'),
+                    (b'x-forwarded-for', b'10.0.0.2'),
+                    (b'cookie', b'sessionid=abc'),
+                    (b'cookie', b'csrftoken=def'),
+                ],
+            },
+            b'text'
+        )
+        self.assertEqual(environ['CONTENT_TYPE'], 'text/plain')
+        self.assertEqual(
+            environ['HTTP_X_FORWARDED_FOR'], '10.0.0.1,10.0.0.2'
+        )
+        self.assertEqual(
+            environ['HTTP_COOKIE'], 'sessionid=abc; csrftoken=def'
+        )
+        self.assertEqual(environ['QUERY_STRING'], 'page=2')
+        self.assertEqual(environ['wsgi.input'].read(), b'text')
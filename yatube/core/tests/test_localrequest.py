@@ -0,0 +1,23 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.localrequest import local_get, local_host
+from core.pagecache import page_cache
+
+
+class LocalRequestTests(TestCase):
+    def setUp(self):
+        page_cache().clear()
+
+    @override_settings(ALLOWED_HOSTS=['.example.com'])
+    def test_request_passes_host_check_and_middleware(self):
+        self.assertEqual(local_host(), 'example.com')
+        url = reverse('posts:index') + '?page=1'
+        response = local_get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Frame-Options'], 'SAMEORIGIN')
+        self.assertEqual(local_get(url)['X-Page-Cache'], 'hit')
+
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def test_wildcard_host_falls_back_to_localhost(self):
+        self.assertEqual(local_host(), 'localhost')
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+import tracemalloc
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from core.memory import cache_entry_sizes, take_snapshot, view_stats
+
+User = get_user_model()
+
+
+class TracingMixin:
+    def setUp(self):
+        super().setUp()
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(5)
+            self.addCleanup(tracemalloc.stop)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        snapshot_dir = self.settings(MEMORY_SNAPSHOT_DIR=directory)
+        snapshot_dir.enable()
+        self.addCleanup(snapshot_dir.disable)
+
+
+class MemoryTrackingTests(TracingMixin, TestCase):
+    def test_requests_are_attributed_to_views(self):
+        view_stats.clear()
+        self.client.get(reverse('about:author'))
+        stats = view_stats['about:author']
+        self.assertEqual(stats['requests'], 1)
+        self.assertGreater(stats['peak'], 0)
+
+    def test_peak_without_reset_peak(self):
+        view_stats.clear()
+        with mock.patch('core.memory.tracemalloc', spec=(
+            'is_tracing', 'get_traced_memory'
+        )) as traced:
+            traced.is_tracing.return_value = True
+            traced.get_traced_memory.side_effect = [(100, 500), (300, 900)]
+            self.client.get(reverse('about:author'))
+        self.assertEqual(view_stats['about:author']['peak'], 200)
+
+    def test_cache_entry_sizes(self):
+        cache.clear()
+        cache.set('small', 'x')
+        cache.set('large', 'x' * 100000)
+        sizes = dict(cache_entry_sizes())
+        large = [size for key, size in sizes.items() if key.endswith('large')]
+        self.assertGreater(large[0], 100000)
+        self.assertEqual(cache_entry_sizes()[0][0], ':1:large')
+
+    def test_snapshot_diff_command(self):
+        first = take_snapshot('before')
+        retained = [bytearray(1000) for _ in range(100)]
+        second = take_snapshot('after')
+        out = StringIO()
+        call_command('memory_diff', first, second, top=5, stdout=out)
+        self.assertIn('test_memory.py', out.getvalue())
+        self.assertEqual(len(retained), 100)
+        self.assertTrue(os.path.basename(second).endswith('-after.dump'))
+
+
+class MemoryViewTests(TracingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('memory')
+
+    def test_memory_view_is_staff_only(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_report_names_the_environment_switch(self):
+        self.client.force_login(
+            User.objects.create_user(username='admin', is_staff=True)
+        )
+        with mock.patch('tracemalloc.is_tracing', return_value=False):
+            report = self.client.get(self.url).content.decode()
+        self.assertIn('MEMORY_TRACKING=1', report)
+
+    def test_report_and_snapshot(self):
+        cache.set('index_page', list(range(1000)))
+        self.client.force_login(
+            User.objects.create_user(username='admin', is_staff=True)
+        )
+        report = self.client.get(self.url).content.decode()
+        self.assertIn('top allocation sites:', report)
+        self.assertIn(':1:index_page', report)
+        self.assertIn('cache entries (pages):', report)
+        response = self.client.get(self.url, {'snapshot': 'manual'})
+        self.assertTrue(os.path.exists(response.content.decode()))
+        response = self.client.get(self.url, {'snapshot': '../etc'})
+        self.assertEqual(response.status_code, 400)
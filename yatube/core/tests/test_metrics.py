@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.metrics import (Counter, Gauge, Histogram, MmapValues, Registry,
+                          read_entries)
+
+User = get_user_model()
+
+
+class MetricsDirMixin:
+    def setUp(self):
+        super().setUp()
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir, ignore_errors=True)
+        settings = self.settings(METRICS_DIR=metrics_dir)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.metrics_dir = metrics_dir
+
+
+class MmapValuesTests(TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'metrics_1.db')
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.path))
+
+    def test_values_survive_reopen_and_growth(self):
+        values = MmapValues(self.path)
+        for i in range(3000):
+            values.add(f'key-{i}', i)
+        values.add('key-1', 1)
+        reopened = MmapValues(self.path)
+        reopened.add('key-2', 1)
+        with open(self.path, 'rb') as file:
+            entries = dict(read_entries(file.read()))
+        self.assertEqual(len(entries), 3000)
+        self.assertEqual(entries['key-1'], 2)
+        self.assertEqual(entries['key-2'], 3)
+
+
+class RegistryTests(MetricsDirMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.registry = Registry()
+
+    def test_processes_are_summed_and_dead_gauges_dropped(self):
+        counter = Counter('test_total', 'test', registry=self.registry)
+        gauge = Gauge('test_in_progress', 'test', registry=self.registry)
+        counter.inc(view='posts:index')
+        gauge.inc()
+        dead = MmapValues(os.path.join(self.metrics_dir, 'metrics_999999.db'))
+        dead.add(counter.key('', {'view': 'posts:index'}), 2)
+        dead.add(gauge.key('', {}), 5)
+        text = self.registry.render()
+        self.assertIn('test_total{view="posts:index"} 3.0', text)
+        self.assertIn('test_in_progress 1.0', text)
+
+    def test_label_values_are_escaped(self):
+        counter = Counter('test_total', 'test', registry=self.registry)
+        counter.inc(path='a"b\\c\nd')
+        self.assertIn(
+            'test_total{path="a\\"b\\\\c\\nd"} 1.0', self.registry.render()
+        )
+
+    def test_histogram_is_cumulative(self):
+        histogram = Histogram(
+            'test_seconds', 'test', buckets=(0.1, 1), registry=self.registry
+        )
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+        text = self.registry.render()
+        self.assertIn('test_seconds_bucket{le="0.1"} 1.0', text)
+        self.assertIn('test_seconds_bucket{le="1.0"} 2.0', text)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 3.0', text)
+        self.assertIn('test_seconds_count 3.0', text)
+
+
+class MetricsViewTests(MetricsDirMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_metrics_report_requests_and_cache(self):
+        self.client.get(reverse('posts:index'))
+        self.client.get(reverse('posts:index'))
+        with self.settings(METRICS_TOKEN='test-token'):
+            text = self.client.get(
+                reverse('metrics'), HTTP_AUTHORIZATION='Bearer test-token'
+            ).content.decode()
+        self.assertIn(
+            'yatube_request_duration_seconds_count{view="posts:index"}', text
+        )
+        self.assertIn(
+            'yatube_cache_requests_total{cache="index_page",result="miss"}',
+            text
+        )
+        self.assertIn('# TYPE yatube_rate_limited_total counter', text)
+
+    def test_metrics_are_not_public(self):
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 403)
+        with self.settings(METRICS_TOKEN='test-token'):
+            response = self.client.get(
+                reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong'
+            )
+        self.assertEqual(response.status_code, 403)
+
+    def test_metrics_for_staff(self):
+        staff = User.objects.create_user(username='test-staff', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
@@ -0,0 +1,124 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.pagecache import page_cache, punch_holes
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class PageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='test-author')
+        cls.group = Group.objects.create(
+            title='test-title', slug='test-slug', description='test'
+        )
+        cls.post = Post.objects.create(
+            text='test-text', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        page_cache().clear()
+        self.group_url = reverse('posts:group_list', args=[self.group.slug])
+        self.detail_url = reverse('posts:post_detail', args=[self.post.pk])
+
+    def test_anonymous_page_is_served_from_cache(self):
+        first = self.client.get(self.group_url)
+        self.assertNotIn('X-Page-Cache', first)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.group_url)
+        self.assertEqual(second['X-Page-Cache'], 'hit')
+        self.assertEqual(second.content, first.content)
+        self.assertIn('Cookie', second['Vary'])
+
+    def test_unknown_query_params_share_one_entry(self):
+        self.client.get(self.group_url)
+        for url in (f'{self.group_url}?x=1', f'{self.group_url}?page=1&x=2',
+                    f'{self.group_url}?page=01'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response['X-Page-Cache'], 'hit')
+        response = self.client.get(f'{self.group_url}?page=2')
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_page_cache_does_not_evict_default_cache(self):
+        cache.set('rate-limit-bucket', 1)
+        for number in range(400):
+            self.client.get(f'/?page=1&x={number}')
+        self.assertEqual(cache.get('rate-limit-bucket'), 1)
+
+    def test_new_post_invalidates_group_page(self):
+        self.client.get(self.group_url)
+        Post.objects.create(
+            text='fresh-text', author=self.author, group=self.group
+        )
+        response = self.client.get(self.group_url)
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertContains(response, 'fresh-text')
+
+    def test_group_delete_invalidates_pages_of_its_posts(self):
+        index_url = reverse('posts:index')
+        self.assertContains(self.client.get(index_url), self.group_url)
+        profile_url = reverse('posts:profile', args=[self.author.username])
+        self.client.get(profile_url)
+        Group.objects.get(pk=self.group.pk).delete()
+        # Список постов главной ещё и в своём 20-секундном кэше.
+        cache.delete('index_page')
+        for url in (index_url, profile_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertNotIn('X-Page-Cache', response)
+                self.assertNotContains(response, self.group_url)
+
+    def test_comment_invalidates_post_detail(self):
+        self.client.get(self.detail_url)
+        Comment.objects.create(
+            text='fresh-comment', author=self.author, post=self.post
+        )
+        self.assertContains(self.client.get(self.detail_url), 'fresh-comment')
+
+    def test_author_rename_invalidates_profile(self):
+        url = reverse('posts:profile', args=[self.author.username])
+        self.client.get(url)
+        self.author.first_name = 'Renamed'
+        self.author.save()
+        self.assertContains(self.client.get(url), 'Renamed')
+
+    def test_logged_in_user_gets_cached_page_with_own_header(self):
+        reader = User.objects.create_user(username='reader')
+        self.client.get(self.group_url)
+        self.client.force_login(reader)
+        response = self.client.get(self.group_url)
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+        self.assertContains(response, 'Пользователь: reader')
+        self.assertContains(response, reverse('users:logout'))
+        self.client.cookies.clear()
+        anonymous = self.client.get(self.group_url)
+        self.assertEqual(anonymous['X-Page-Cache'], 'hit')
+        self.assertNotContains(anonymous, 'Пользователь: reader')
+
+    def test_logged_in_render_is_not_stored(self):
+        self.client.force_login(self.author)
+        self.client.get(self.group_url)
+        self.client.logout()
+        response = self.client.get(self.group_url)
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertNotContains(response, reverse('users:logout'))
+
+    def test_user_dependent_page_is_not_shared(self):
+        self.client.get(self.detail_url)
+        self.client.force_login(self.author)
+        response = self.client.get(self.detail_url)
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertContains(response, 'csrfmiddlewaretoken')
+
+    def test_punch_holes_rerenders_only_marked_fragments(self):
+        response = self.client.get(self.group_url)
+        request = response.wsgi_request
+        content = response.content.decode()
+        self.assertIn('<!--hole:includes/header.html-->', content)
+        self.assertEqual(punch_holes(content, request), content)
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.ratelimit import TokenBucket, parse_rate
+
+User = get_user_model()
+
+
+@override_settings(RATE_LIMITS={'users:signup': '2/m'})
+class RateLimitMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_requests_over_limit_are_rejected(self):
+        url = reverse('users:signup')
+        for _ in range(2):
+            self.assertEqual(self.client.post(url).status_code, 200)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(response['Retry-After'], ('29', '30'))
+
+    def test_limits_are_per_client(self):
+        url = reverse('users:signup')
+        for _ in range(3):
+            self.client.post(url, REMOTE_ADDR='10.0.0.1')
+        response = self.client.post(url, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.cached_db'
+    )
+    def test_rejected_request_makes_no_queries(self):
+        user = User.objects.create_user(username='test-user')
+        client = Client()
+        client.force_login(user)
+        url = reverse('users:signup')
+        client.post(url)
+        client.post(url)
+        with self.assertNumQueries(0):
+            response = client.post(url)
+        self.assertEqual(response.status_code, 429)
+
+    def test_safe_methods_are_not_limited(self):
+        url = reverse('users:signup')
+        for _ in range(5):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(RATE_LIMITS={'posts:profile_follow': '2/m'})
+    def test_follow_links_are_limited(self):
+        author = User.objects.create_user(username='test-author')
+        self.client.force_login(User.objects.create_user(username='fan'))
+        url = reverse('posts:profile_follow', args=[author.username])
+        for _ in range(2):
+            self.assertEqual(self.client.get(url).status_code, 302)
+        self.assertEqual(self.client.get(url).status_code, 429)
+
+    def test_unlimited_views_pass(self):
+        for _ in range(5):
+            response = self.client.get(reverse('about:author'))
+            self.assertEqual(response.status_code, 200)
+
+
+class TokenBucketTests(TestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('30/m'), (0.5, 30))
+
+    def test_bucket_refills(self):
+        cache.clear()
+        bucket = TokenBucket(cache)
+        self.assertEqual(bucket.take('key', 1000, 1), 0)
+        self.assertGreater(bucket.take('key', 0.001, 1), 0)
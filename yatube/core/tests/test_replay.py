@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from core.replay import (Replay, authenticated_clients, parse_log,
+                         percentile)
+from posts.models import Group
+
+User = get_user_model()
+
+AGENT = '"-" "Mozilla/5.0"'
+LOG = [
+    f'10.0.0.1 - - [19/Oct/2026:10:00:00 +0000] "GET / HTTP/1.1" 200 512 '
+    f'{AGENT}',
+    f'10.0.0.2 - - [19/Oct/2026:10:00:00 +0000] "GET /follow/ HTTP/1.1" '
+    f'200 512 {AGENT}',
+    f'10.0.0.2 - - [19/Oct/2026:10:00:01 +0000] "GET /group/news/ '
+    f'HTTP/1.1" 200 512 {AGENT}',
+    f'10.0.0.3 - - [19/Oct/2026:10:00:01 +0000] "GET /follow/ HTTP/1.1" '
+    f'302 0 {AGENT}',
+    f'10.0.0.3 - - [19/Oct/2026:10:00:02 +0000] "GET /group/gone/ '
+    f'HTTP/1.1" 200 512 {AGENT}',
+    f'10.0.0.4 - - [19/Oct/2026:10:00:02 +0000] "POST /create/ HTTP/1.1" '
+    f'302 0 {AGENT}',
+    'garbage line',
+]
+
+
+class ParseLogTests(SimpleTestCase):
+    def test_entries_and_routes(self):
+        entries = list(parse_log(LOG))
+        self.assertEqual(len(entries), 6)
+        self.assertEqual(entries[0].route, 'posts:index')
+        self.assertEqual(entries[2].route, 'posts:group_list')
+        self.assertEqual(entries[0].client, '10.0.0.1 Mozilla/5.0')
+        self.assertEqual(entries[5].method, 'POST')
+
+    def test_authenticated_clients(self):
+        clients = authenticated_clients(list(parse_log(LOG)))
+        self.assertEqual(clients, {'10.0.0.2 Mozilla/5.0'})
+        line = ('10.0.0.9 - alice [19/Oct/2026:10:00:00 +0000] '
+                '"GET / HTTP/1.1" 200 512')
+        self.assertEqual(
+            authenticated_clients(list(parse_log([line]))), {'alice'}
+        )
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile(values, 1), 100)
+        self.assertEqual(percentile([7], 0.5), 7)
+
+
+class ReplayTests(LiveServerTestCase):
+    def setUp(self):
+        Group.objects.create(title='news', slug='news', description='news')
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.log = os.path.join(directory, 'access.log')
+        with open(self.log, 'w') as file:
+            file.write('\n'.join(LOG) + '\n')
+
+    def test_replay_reports_latencies_and_deviations(self):
+        out = StringIO()
+        call_command(
+            'replay_log', self.log, base_url=self.live_server_url,
+            speed=0, concurrency=2, stdout=out
+        )
+        report = out.getvalue()
+        self.assertIn('Запросов: 5 из 6, залогиненных клиентов: 1', report)
+        self.assertIn('posts:follow_index: 2,', report)
+        self.assertIn('posts:group_list: 200 -> 404 x1', report)
+        self.assertNotIn('posts:follow_index: 200 ->', report)
+        self.assertTrue(User.objects.filter(username='replay_1').exists())
+
+    def test_original_timing_is_kept(self):
+        entries = [
+            entry for entry in parse_log(LOG) if entry.method == 'GET'
+        ]
+        replay = Replay(self.live_server_url, 4, speed=4).run(entries)
+        self.assertEqual(sum(map(len, replay.latencies.values())), 5)
+        self.assertIn('max schedule lag', replay.report()[-1])
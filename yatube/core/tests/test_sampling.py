@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import middleware
+from core.sampling import collapsed, sample_stacks, speedscope
+
+User = get_user_model()
+
+
+def busy_view(stop):
+    middleware._views_by_thread[threading.get_ident()] = 'posts:index'
+    try:
+        while not stop.is_set():
+            sum(range(1000))
+    finally:
+        middleware._views_by_thread.pop(threading.get_ident(), None)
+
+
+class SamplingTests(TestCase):
+    def sample_busy_view(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_view, args=(stop,))
+        worker.start()
+        try:
+            time.sleep(0.01)
+            return sample_stacks(0.2, 200, views_only=True)
+        finally:
+            stop.set()
+            worker.join()
+
+    def test_samples_are_tagged_with_view_name(self):
+        samples = self.sample_busy_view()
+        self.assertTrue(samples)
+        for (tag, stack), count in samples.items():
+            self.assertEqual(tag, 'posts:index')
+            self.assertTrue(
+                any(frame.startswith('busy_view (') for frame in stack)
+            )
+
+    def test_collapsed_and_speedscope_output(self):
+        samples = self.sample_busy_view()
+        lines = collapsed(samples).splitlines()
+        self.assertTrue(lines[0].startswith('posts:index;'))
+        self.assertEqual(
+            sum(int(line.rsplit(' ', 1)[1]) for line in lines),
+            sum(samples.values())
+        )
+        profile = json.loads(speedscope(samples, 200))
+        self.assertEqual(profile['profiles'][0]['name'], 'posts:index')
+        self.assertAlmostEqual(
+            profile['profiles'][0]['endValue'], sum(samples.values()) / 200
+        )
+        frames = profile['shared']['frames']
+        for sample in profile['profiles'][0]['samples']:
+            self.assertTrue(all(index < len(frames) for index in sample))
+
+
+class ProfilerViewTests(TestCase):
+    def setUp(self):
+        self.url = reverse('profiler')
+
+    def test_profiler_is_staff_only(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(User.objects.create_user(username='user'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_staff_gets_profile(self):
+        self.client.force_login(
+            User.objects.create_user(username='admin', is_staff=True)
+        )
+        response = self.client.get(
+            self.url, {'seconds': 0.05, 'format': 'speedscope'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('profiles', json.loads(response.content))
+        response = self.client.get(self.url, {'seconds': 'many'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url, {'seconds': 3600})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(PROFILER_TOKEN='secret')
+    def test_token_gives_access(self):
+        response = self.client.get(
+            self.url, {'seconds': 0.05}, HTTP_AUTHORIZATION='Bearer secret'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            self.url, {'seconds': 0.05}, HTTP_AUTHORIZATION='Bearer wrong'
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(PROFILER_TOKEN='secret')
+class SampleProfileCommandTests(LiveServerTestCase):
+    def test_samples_running_server(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, 'profile.txt')
+        call_command(
+            'sample_profile', base_url=self.live_server_url, seconds=0.2,
+            output=output, stderr=StringIO()
+        )
+        with open(output) as file:
+            self.assertIn('thread:', file.read())
+
+    def test_refused_profile_is_an_error(self):
+        with override_settings(PROFILER_TOKEN=''):
+            with self.assertRaisesRegex(CommandError, '403'):
+                call_command(
+                    'sample_profile', base_url=self.live_server_url,
+                    seconds=0.05
+                )
@@ -0,0 +1,207 @@
+import datetime as dt
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from yatube.settings import ARCHIVE_AFTER_DAYS
+from yatube.settings import SCHEDULED_JOBS as BUILTIN_JOBS
+
+from core.jobs import sqlite_vacuum
+from core.models import JobLock, JobRun, Task
+from core.scheduler import acquire, load_jobs, periodic, run_due
+from posts.models import ArchivedPost, Post
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+calls = []
+
+
+@periodic
+def scheduler_test_job():
+    calls.append(1)
+    return 'done'
+
+
+@periodic
+def scheduler_failing_job():
+    raise ValueError('boom')
+
+
+class SchedulerTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        calls.clear()
+        jobs_settings = self.settings(SCHEDULED_JOBS={
+            'scheduler_test_job': 60,
+        })
+        jobs_settings.enable()
+        self.addCleanup(jobs_settings.disable)
+
+    def test_due_job_runs_once_per_interval(self):
+        now = timezone.now()
+        runs = run_due('node-1', now)
+        self.assertEqual(len(runs), 1)
+        self.assertTrue(runs[0].success)
+        self.assertEqual(runs[0].result, 'done')
+        soon = now + dt.timedelta(seconds=30)
+        self.assertEqual(run_due('node-2', soon), [])
+        later = now + dt.timedelta(minutes=2)
+        self.assertEqual(len(run_due('node-2', later)), 1)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(
+            list(JobRun.objects.values_list('owner', flat=True)),
+            ['node-2', 'node-1']
+        )
+
+    def test_locked_job_is_not_run_by_other_node(self):
+        now = timezone.now()
+        self.assertTrue(acquire('scheduler_test_job', 'node-1', now))
+        self.assertFalse(acquire('scheduler_test_job', 'node-2', now))
+        self.assertEqual(run_due('node-2', now), [])
+        later = now + dt.timedelta(hours=2)
+        self.assertTrue(acquire('scheduler_test_job', 'node-2', later))
+
+    def test_failure_is_recorded_and_lock_released(self):
+        with self.settings(SCHEDULED_JOBS={'scheduler_failing_job': 60}):
+            with self.assertLogs('core.scheduler', 'ERROR'):
+                run = run_due('node-1')[0]
+        self.assertFalse(run.success)
+        self.assertIn('boom', run.result)
+        lock = JobLock.objects.get(name='scheduler_failing_job')
+        self.assertIsNone(lock.locked_until)
+        self.assertGreater(lock.next_run, run.started)
+
+    def test_builtin_jobs_are_registered(self):
+        for name in BUILTIN_JOBS:
+            self.assertIn(name, load_jobs())
+
+    def test_sqlite_analyze_job(self):
+        self.assertEqual(load_jobs()['sqlite_analyze'](), 'analyzed')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE name='sqlite_stat1'"
+            )
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_clear_sessions_job(self):
+        Session.objects.create(
+            session_key='expired',
+            session_data='',
+            expire_date=timezone.now() - dt.timedelta(days=1)
+        )
+        Session.objects.create(
+            session_key='alive',
+            session_data='',
+            expire_date=timezone.now() + dt.timedelta(days=1)
+        )
+        load_jobs()['clear_sessions']()
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            ['alive']
+        )
+
+    def test_purge_tasks_job(self):
+        old = timezone.now() - dt.timedelta(days=8)
+        for key, status, finished in (
+            ('old-done', Task.DONE, old),
+            ('old-failed', Task.FAILED, old),
+            ('fresh-done', Task.DONE, timezone.now()),
+            ('old-queued', Task.QUEUED, None),
+        ):
+            Task.objects.create(
+                name='test', key=key, status=status, finished=finished
+            )
+        with self.settings(TASK_RETENTION_DAYS=7):
+            self.assertEqual(load_jobs()['purge_tasks'](), 'purged tasks: 2')
+        self.assertEqual(
+            set(Task.objects.values_list('key', flat=True)),
+            {'fresh-done', 'old-queued'}
+        )
+
+    def test_archive_old_posts_job(self):
+        author = User.objects.create_user(username='test-author')
+        old = Post.objects.create(text='old', author=author)
+        Post.objects.filter(pk=old.pk).update(
+            pub_date=timezone.now() - dt.timedelta(days=ARCHIVE_AFTER_DAYS + 1)
+        )
+        fresh = Post.objects.create(text='fresh', author=author)
+        self.assertEqual(
+            load_jobs()['archive_old_posts'](), 'archived posts: 1'
+        )
+        self.assertTrue(ArchivedPost.objects.filter(pk=old.pk).exists())
+        self.assertEqual(list(Post.objects.all()), [fresh])
+
+    @override_settings(MEDIA_ROOT=MEDIA_ROOT)
+    def test_prune_thumbnails_job(self):
+        from sorl.thumbnail import default, get_thumbnail
+        from sorl.thumbnail.images import ImageFile
+        author = User.objects.create_user(username='test-author')
+        posts = [
+            Post.objects.create(
+                text=name,
+                author=author,
+                image=SimpleUploadedFile(name, SMALL_GIF, 'image/gif')
+            )
+            for name in ('kept.gif', 'dropped.gif')
+        ]
+        thumbnails = [
+            get_thumbnail(post.image, '10x10') for post in posts
+        ]
+        kept, dropped = [post.image.name for post in posts]
+        Post.objects.filter(pk=posts[1].pk).update(image='')
+        self.assertEqual(
+            load_jobs()['prune_thumbnails'](), 'pruned images: 1'
+        )
+        self.assertTrue(thumbnails[0].exists())
+        self.assertFalse(thumbnails[1].exists())
+        self.assertIsNotNone(default.kvstore.get(ImageFile(kept)))
+        self.assertIsNone(default.kvstore.get(ImageFile(dropped)))
+
+    def test_history_command(self):
+        run_due('node-1')
+        out = StringIO()
+        call_command('run_scheduler', history=5, stdout=out)
+        self.assertIn('scheduler_test_job ok', out.getvalue())
+
+
+class SqliteVacuumTests(TransactionTestCase):
+    def auto_vacuum(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA auto_vacuum')
+            return cursor.fetchone()[0]
+
+    def test_vacuum_needs_explicit_incremental_mode(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA auto_vacuum = NONE')
+            cursor.execute('VACUUM')
+        with self.assertLogs('core.jobs', 'WARNING'):
+            self.assertTrue(sqlite_vacuum().startswith('skipped'))
+        self.assertEqual(self.auto_vacuum(), 0)
+        out = StringIO()
+        call_command('sqlite_incremental_vacuum', stdout=out)
+        self.assertIn('INCREMENTAL', out.getvalue())
+        self.assertEqual(self.auto_vacuum(), 2)
+        self.assertTrue(sqlite_vacuum().startswith('freed pages'))
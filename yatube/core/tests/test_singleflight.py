@@ -0,0 +1,92 @@
+import threading
+import time
+
+from django.test import TestCase
+from django.urls import reverse
+
+from core.pagecache import page_cache, page_key
+from core.singleflight import SingleFlight, flights
+from posts.models import Group
+
+
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        page_cache().clear()
+        self.flight = SingleFlight()
+
+    def test_only_first_caller_leads(self):
+        self.assertTrue(self.flight.lead('key'))
+        self.assertFalse(self.flight.lead('key'))
+        self.flight.done('key')
+        self.assertTrue(self.flight.lead('key'))
+
+    def test_waiters_are_released_when_leader_is_done(self):
+        self.flight.lead('key')
+        results = []
+        waiters = [
+            threading.Thread(
+                target=lambda: results.append(self.flight.wait('key'))
+            )
+            for _ in range(5)
+        ]
+        for waiter in waiters:
+            waiter.start()
+        self.flight.done('key')
+        for waiter in waiters:
+            waiter.join()
+        self.assertEqual(results, [True] * 5)
+
+    def test_leader_of_other_instance_is_seen_through_cache(self):
+        other = SingleFlight()
+        self.assertTrue(other.lead('key'))
+        self.assertFalse(self.flight.lead('key'))
+        threading.Timer(0.1, other.done, ['key']).start()
+        self.assertTrue(self.flight.wait('key'))
+
+    def test_wait_times_out(self):
+        self.flight.lead('key')
+        with self.settings(SINGLE_FLIGHT_TIMEOUT=0.05):
+            started = time.monotonic()
+            self.assertFalse(self.flight.wait('key'))
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class CoalescedPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(
+            title='test-title', slug='test-slug', description='test'
+        )
+
+    def setUp(self):
+        page_cache().clear()
+        self.url = reverse('posts:group_list', args=[self.group.slug])
+
+    def test_duplicate_request_waits_for_leader_page(self):
+        rendered = self.client.get(self.url)
+        key = page_key(rendered.wsgi_request)
+        entry = page_cache().get(key)
+        page_cache().clear()
+        self.assertTrue(flights.lead(key))
+
+        def finish_leader():
+            page_cache().set_many(entry['tags'], None)
+            page_cache().set(key, entry)
+            flights.done(key)
+
+        threading.Timer(0.1, finish_leader).start()
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'coalesced')
+        self.assertEqual(response.content, rendered.content)
+
+    def test_waiter_renders_itself_after_timeout(self):
+        request = self.client.get(self.url).wsgi_request
+        page_cache().clear()
+        key = page_key(request)
+        flights.lead(key)
+        self.addCleanup(flights.done, key)
+        with self.settings(SINGLE_FLIGHT_TIMEOUT=0.05):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Page-Cache', response)
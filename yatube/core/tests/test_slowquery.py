@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.slowquery import journal_files, slow_query_logger
+from posts.models import Post
+
+User = get_user_model()
+SLOW_QUERY_LOG = os.path.join(tempfile.mkdtemp(), 'slow_queries.jsonl')
+
+
+@override_settings(SLOW_QUERY_LOG=SLOW_QUERY_LOG)
+class SlowQueryLoggerTests(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(username='test-author')
+        Post.objects.create(text='test-text', author=author)
+        self.addCleanup(
+            lambda: os.path.exists(SLOW_QUERY_LOG)
+            and os.remove(SLOW_QUERY_LOG)
+        )
+
+    def test_logger_is_installed_on_connections(self):
+        self.assertIn(slow_query_logger, connection.execute_wrappers)
+
+    def entries(self):
+        with open(SLOW_QUERY_LOG) as log:
+            return [json.loads(line) for line in log]
+
+    def test_slow_query_is_logged_with_plan_view_and_frame(self):
+        with self.assertLogs('core.slowquery', 'WARNING'):
+            with self.settings(SLOW_QUERY_THRESHOLD=0):
+                self.client.get(
+                    reverse('posts:profile',
+                            kwargs={'username': 'test-author'})
+                )
+        entries = [
+            entry for entry in self.entries()
+            if 'FROM "posts_post"' in entry['sql']
+        ]
+        self.assertTrue(entries)
+        self.assertEqual(entries[0]['view'], 'posts:profile')
+        self.assertIn('posts', entries[0]['frame'])
+        self.assertTrue(entries[0]['plan'])
+
+    def test_unwritable_log_does_not_break_queries(self):
+        blocker = os.path.join(tempfile.mkdtemp(), 'file')
+        open(blocker, 'w').close()
+        path = os.path.join(blocker, 'slow_queries.jsonl')
+        with self.assertLogs('core.slowquery', 'ERROR') as logs:
+            with self.settings(SLOW_QUERY_THRESHOLD=0, SLOW_QUERY_LOG=path):
+                count = Post.objects.count()
+        self.assertEqual(count, 1)
+        self.assertIn('Slow query was not recorded', logs.output[-1])
+
+    def test_log_is_rotated(self):
+        self.addCleanup(
+            lambda: os.path.exists(f'{SLOW_QUERY_LOG}.1')
+            and os.remove(f'{SLOW_QUERY_LOG}.1')
+        )
+        with self.assertLogs('core.slowquery', 'WARNING'):
+            with self.settings(SLOW_QUERY_THRESHOLD=0,
+                               SLOW_QUERY_LOG_MAX_BYTES=1,
+                               SLOW_QUERY_LOG_BACKUPS=1):
+                Post.objects.count()
+                Post.objects.count()
+                self.assertEqual(
+                    journal_files(), [f'{SLOW_QUERY_LOG}.1', SLOW_QUERY_LOG]
+                )
+
+    def test_failed_query_is_raised_and_not_recorded(self):
+        with mock.patch.object(slow_query_logger, 'record') as record:
+            with self.settings(SLOW_QUERY_THRESHOLD=0):
+                with self.assertRaises(Exception) as error:
+                    with connections['default'].cursor() as cursor:
+                        cursor.execute('SELECT * FROM missing_table')
+        self.assertIn('missing_table', str(error.exception))
+        record.assert_not_called()
+
+    def test_explain_bypasses_other_wrappers(self):
+        calls = []
+
+        def counter(execute, sql, params, many, context):
+            calls.append(sql)
+            return execute(sql, params, many, context)
+
+        with self.assertLogs('core.slowquery', 'WARNING'):
+            with self.settings(SLOW_QUERY_THRESHOLD=0):
+                with connection.execute_wrapper(counter):
+                    with self.assertNumQueries(1):
+                        Post.objects.count()
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(self.entries()[-1]['plan'])
+
+    def test_command_summarizes_log(self):
+        with self.assertLogs('core.slowquery', 'WARNING'):
+            with self.settings(SLOW_QUERY_THRESHOLD=0):
+                self.client.get(reverse('posts:index'))
+                self.client.get(reverse('posts:index'))
+        out = StringIO()
+        call_command('slow_queries', view='posts:index', stdout=out)
+        self.assertIn('view: posts:index', out.getvalue())
+        self.assertIn('план:', out.getvalue())
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TestCase
+from django.urls import reverse
+
+from core.pagecache import page_cache, page_key, stale_page_cache
+from core.stale import db_available, refresher
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+def locked(execute, sql, params, many, context):
+    raise OperationalError('database is locked')
+
+
+class StaleOnErrorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test-user')
+        cls.group = Group.objects.create(
+            title='test-title', slug='test-slug', description='test'
+        )
+        Post.objects.create(
+            text='test-text', author=cls.user, group=cls.group
+        )
+
+    def setUp(self):
+        page_cache().clear()
+        stale_page_cache().clear()
+        self.url = reverse('posts:group_list', args=[self.group.slug])
+        schedule = mock.patch.object(refresher, 'schedule')
+        self.schedule = schedule.start()
+        self.addCleanup(schedule.stop)
+
+    def expire_page(self, response):
+        page_cache().delete(page_key(response.wsgi_request))
+
+    def test_last_good_page_is_served_when_db_fails(self):
+        good = self.client.get(self.url)
+        self.expire_page(good)
+        with connection.execute_wrapper(locked):
+            with self.assertLogs('core.pagecache', 'WARNING'):
+                response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Page-Cache'], 'stale')
+        self.assertIn('Revalidation Failed', response['Warning'])
+        self.assertContains(response, 'test-text')
+        self.schedule.assert_called_once_with(self.url)
+
+    def test_logged_in_user_gets_stale_page_with_own_header(self):
+        self.expire_page(self.client.get(self.url))
+        reader = User.objects.create_user(username='reader')
+        self.client.force_login(reader)
+        error = OperationalError('database is locked')
+        with mock.patch('posts.views.Paginator.get_page', side_effect=error):
+            with self.assertLogs('core.pagecache', 'WARNING'):
+                response = self.client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'stale')
+        self.assertContains(response, 'Пользователь: reader')
+
+    def test_error_without_last_good_copy_is_raised(self):
+        with connection.execute_wrapper(locked):
+            with self.assertRaises(OperationalError):
+                self.client.get(self.url)
+        self.schedule.assert_not_called()
+
+    def test_refresh_waits_for_db_and_rerenders(self):
+        good = self.client.get(self.url)
+        self.expire_page(good)
+        refresher.paths.add(self.url)
+        with connection.execute_wrapper(locked):
+            self.assertFalse(db_available())
+            self.assertFalse(refresher.refresh())
+        self.assertEqual(refresher.paths, {self.url})
+        self.assertTrue(refresher.refresh())
+        self.assertEqual(refresher.paths, set())
+        self.assertIsNotNone(page_cache().get(page_key(good.wsgi_request)))
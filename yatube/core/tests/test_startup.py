@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from core.management.commands.profile_startup import (parse_importtime,
+                                                      profile_startup)
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        imports = parse_importtime(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        300 |   posts.models\n'
+        )
+        self.assertEqual(imports, {'posts.models': (120, 300)})
+
+    def test_worker_start_does_not_load_image_libraries(self):
+        report = profile_startup()
+        self.assertIn('posts', report['ready'])
+        self.assertIn('posts.views', report['imports'])
+        for name in settings.STARTUP_HEAVY_MODULES:
+            with self.subTest(module=name):
+                self.assertNotIn(name, report['modules'])
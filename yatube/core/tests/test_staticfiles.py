@@ -0,0 +1,121 @@
+import gzip
+import os
+import re
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import TestCase
+
+from core.staticfiles import accepted_encodings, hashed_names
+
+CSS = b'body { color: #333; }\n' * 200
+
+
+def linked_static():
+    """Файлы, на которые ссылаются шаблоны: с манифестом они обязательны."""
+    names = set()
+    for root, _, files in os.walk(settings.TEMPLATES[0]['DIRS'][0]):
+        for name in files:
+            with open(os.path.join(root, name)) as file:
+                content = file.read()
+            names.update(re.findall(r"{% static '([^']+)' %}", content))
+    return names
+
+
+class StaticFilesTests(TestCase):
+    def setUp(self):
+        source = tempfile.mkdtemp()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source)
+        self.addCleanup(shutil.rmtree, root)
+        os.makedirs(os.path.join(source, 'css'))
+        with open(os.path.join(source, 'css', 'site.css'), 'wb') as file:
+            file.write(CSS)
+        for name in linked_static():
+            path = os.path.join(source, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'wb').close()
+        with open(os.path.join(source, 'logo.png'), 'wb') as file:
+            file.write(b'\x89PNG not really')
+        override = self.settings(
+            STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=[
+                'django.contrib.staticfiles.finders.FileSystemFinder'
+            ],
+            STATIC_ROOT=root
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        staticfiles_storage._setup()
+        hashed_names.cache_clear()
+        self.addCleanup(hashed_names.cache_clear)
+        self.root = root
+        self.css = staticfiles_storage.stored_name('css/site.css')
+
+    def test_collect_fingerprints_and_compresses(self):
+        self.assertRegex(self.css, r'^css/site\.[0-9a-f]{12}\.css$')
+        self.assertEqual(static('css/site.css'), f'/static/{self.css}')
+        path = os.path.join(self.root, self.css)
+        with open(path + '.gz', 'rb') as file:
+            self.assertEqual(gzip.decompress(file.read()), CSS)
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, 'logo.png.gz'))
+        )
+
+    def test_unknown_name_with_manifest_is_an_error(self):
+        with self.assertRaisesRegex(ValueError, 'manifest entry'):
+            staticfiles_storage.stored_name('css/typo.css')
+
+    def test_hashed_file_is_immutable_and_negotiated(self):
+        response = self.client.get(
+            f'/static/{self.css}', HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        body = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), CSS)
+
+    def test_identity_when_encoding_not_accepted(self):
+        response = self.client.get(
+            f'/static/{self.css}', HTTP_ACCEPT_ENCODING='gzip;q=0'
+        )
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), CSS)
+
+    def test_unhashed_name_is_cached_briefly(self):
+        response = self.client.get('/static/css/site.css')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+    def test_not_modified_and_missing(self):
+        response = self.client.get(f'/static/{self.css}')
+        response = self.client.get(
+            f'/static/{self.css}',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/static/nope.css').status_code, 404)
+        self.assertEqual(
+            self.client.get('/static/../manage.py').status_code, 404
+        )
+
+    def test_brotli_is_preferred(self):
+        response = self.client.get(
+            f'/static/{self.css}', HTTP_ACCEPT_ENCODING='gzip, br'
+        )
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+    def test_accepted_encodings(self):
+        self.assertEqual(
+            accepted_encodings('gzip;q=0.5, identity, br;q=0'),
+            {'gzip', 'identity'}
+        )
+        self.assertEqual(accepted_encodings('*'), {'*', 'br', 'gzip'})
@@ -0,0 +1,138 @@
+import datetime as dt
+import json
+import re
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Task
+from core.tasks import claim, execute, retry_delay, run_pending, task
+from posts.models import Post
+
+User = get_user_model()
+
+calls = []
+
+
+@task(queue='test', max_attempts=2)
+def record(value):
+    calls.append(value)
+
+
+@task(queue='test', max_attempts=2)
+def explode():
+    raise ValueError('boom')
+
+
+@override_settings(TASKS_EAGER=False)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueued_task_runs_once(self):
+        record.enqueue('first')
+        self.assertEqual(calls, [])
+        self.assertEqual(run_pending('test'), 1)
+        self.assertEqual(run_pending('test'), 0)
+        self.assertEqual(calls, ['first'])
+        self.assertEqual(Task.objects.get().status, Task.DONE)
+
+    def test_idempotency_key_skips_duplicates(self):
+        self.assertIsNotNone(record.enqueue('a', key='once'))
+        self.assertIsNone(record.enqueue('b', key='once'))
+        run_pending('test')
+        self.assertEqual(calls, ['a'])
+
+    def test_failed_task_is_retried_with_backoff(self):
+        explode.enqueue()
+        before = timezone.now()
+        with self.assertLogs('core.tasks', 'ERROR'):
+            run_pending('test')
+        failed = Task.objects.get()
+        self.assertEqual(failed.status, Task.QUEUED)
+        self.assertIn('boom', failed.error)
+        self.assertGreaterEqual(
+            failed.run_at, before + dt.timedelta(seconds=retry_delay(1))
+        )
+        self.assertIsNone(claim('test'))
+        Task.objects.update(run_at=timezone.now())
+        with self.assertLogs('core.tasks', 'ERROR'):
+            run_pending('test')
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, Task.FAILED)
+        self.assertEqual(failed.attempts, 2)
+
+    def test_delayed_task_waits_for_run_at(self):
+        record.enqueue('later', delay=60)
+        self.assertEqual(run_pending('test'), 0)
+
+    def test_stale_running_task_is_reclaimed(self):
+        record.enqueue('stale')
+        first = claim('test')
+        self.assertIsNone(claim('test'))
+        Task.objects.update(
+            locked_until=timezone.now() - dt.timedelta(seconds=1)
+        )
+        second = claim('test')
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(second.attempts, 2)
+        self.assertEqual(execute(second), Task.DONE)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        record.enqueue('now')
+        self.assertEqual(calls, ['now'])
+        self.assertFalse(Task.objects.exists())
+
+    @override_settings(TASK_QUEUES={'default': 1, 'test': 1})
+    def test_run_workers_once(self):
+        record.enqueue('command')
+        out = StringIO()
+        call_command('run_workers', queue=['test'], once=True, stdout=out)
+        self.assertEqual(calls, ['command'])
+        self.assertIn('test: выполнено задач 1', out.getvalue())
+        self.assertEqual(Task.objects.get().status, Task.DONE)
+
+    def test_done_task_forgets_arguments(self):
+        record.enqueue('secret')
+        run_pending('test')
+        self.assertEqual(Task.objects.get().arguments, '{}')
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    TASKS_EAGER=False
+)
+class QueuedSideEffectsTests(TestCase):
+    def test_password_reset_email_is_sent_by_worker(self):
+        user = User.objects.create_user(
+            username='reader', email='reader@test.ru', password='secret-pass'
+        )
+        self.client.post(
+            reverse('users:password_reset_form'), {'email': 'reader@test.ru'}
+        )
+        self.assertEqual(len(mail.outbox), 0)
+        queued = Task.objects.get(queue='emails')
+        self.assertEqual(json.loads(queued.arguments)['args'][0], user.pk)
+        self.assertNotIn('reader@test.ru', queued.arguments)
+        self.assertNotIn('http', queued.arguments)
+        self.assertEqual(run_pending('emails'), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['reader@test.ru'])
+        link = re.search(r'http://testserver(\S+)', mail.outbox[0].body)
+        response = self.client.get(link[1], follow=True)
+        self.assertContains(response, 'new_password1')
+
+    def test_post_image_queues_thumbnail(self):
+        author = User.objects.create_user(username='author')
+        post = Post.objects.create(
+            author=author, text='text', image='posts/small.gif'
+        )
+        post.save()
+        queued = Task.objects.get(queue='thumbnails')
+        self.assertEqual(queued.key, 'thumbnail:posts/small.gif')
@@ -0,0 +1,21 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from core.context_processors.nav import nav_urls
+from core.warmup import warm_templates
+
+
+class TemplatesWarmupTests(TestCase):
+    def test_warm_templates_compiles_project_templates(self):
+        names = warm_templates()
+        self.assertIn('posts/index.html', names)
+        self.assertIn('includes/header.html', names)
+
+    def test_nav_urls_are_reversed(self):
+        urls = nav_urls()
+        self.assertEqual(urls['index'], reverse('posts:index'))
+        self.assertEqual(urls['signup'], reverse('users:signup'))
+
+    def test_header_uses_nav_urls(self):
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, f'href="{reverse("users:login")}"')
@@ -1,4 +1,23 @@
+import os
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.staticfiles.views import serve
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseBadRequest, HttpResponseForbidden,
+                         HttpResponseNotModified)
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .memory import memory_report, take_snapshot
+from .metrics import REGISTRY
+from .sampling import collapsed, sample_stacks, speedscope
+from .staticfiles import content_type, hashed_names, negotiate
 
 
 def page_not_found(request, exception):
@@ -20,3 +39,116 @@ def permission_denied(request, exception):
 
 def server_error(request):
     return render(request, 'core/500.html')
+
+
+def has_bearer_token(request, token):
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(token) and constant_time_compare(header, f'Bearer {token}')
+
+
+def metrics(request):
+    """Метрики всех процессов в текстовом формате Prometheus.
+
+    Доступны staff и по заголовку «Authorization: Bearer METRICS_TOKEN».
+    Адрес клиента не проверяется: за прокси все приходят с 127.0.0.1.
+    """
+    if not (has_bearer_token(request, settings.METRICS_TOKEN)
+            or request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        REGISTRY.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+def profiler(request):
+    """Профиль всех потоков процесса за ?seconds= секунд.
+
+    Доступен staff и по заголовку «Authorization: Bearer PROFILER_TOKEN».
+    ?format=speedscope отдаёт JSON для speedscope.app, иначе — свёрнутые
+    стеки для flamegraph.pl.
+    """
+    if not (has_bearer_token(request, settings.PROFILER_TOKEN)
+            or request.user.is_staff):
+        return HttpResponseForbidden()
+    try:
+        seconds = float(request.GET.get('seconds', 10))
+        rate = float(request.GET.get('rate', settings.PROFILER_RATE))
+    except ValueError:
+        return HttpResponseBadRequest('seconds и rate должны быть числами')
+    if not (0 < seconds <= settings.PROFILER_MAX_SECONDS
+            and 0 < rate <= settings.PROFILER_MAX_RATE):
+        return HttpResponseBadRequest('seconds или rate вне допустимых границ')
+    samples = sample_stacks(
+        seconds, rate, views_only=bool(request.GET.get('views_only'))
+    )
+    if request.GET.get('format') == 'speedscope':
+        response = HttpResponse(
+            speedscope(samples, rate), content_type='application/json'
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="profile.speedscope.json"'
+        )
+        return response
+    return HttpResponse(
+        collapsed(samples), content_type='text/plain; charset=utf-8'
+    )
+
+
+def memory(request):
+    """Отчёт о памяти процесса; ?snapshot=метка сохраняет снимок."""
+    if not request.user.is_staff:
+        return HttpResponseForbidden()
+    label = request.GET.get('snapshot')
+    if label is not None:
+        if not label.isidentifier():
+            return HttpResponseBadRequest('Метка: буквы, цифры и _')
+        if not tracemalloc.is_tracing():
+            return HttpResponseBadRequest('tracemalloc выключен')
+        return HttpResponse(
+            take_snapshot(label), content_type='text/plain; charset=utf-8'
+        )
+    return HttpResponse(
+        memory_report(), content_type='text/plain; charset=utf-8'
+    )
+
+
+def static_file(request, path):
+    """Файл из STATIC_ROOT со сжатой копией под Accept-Encoding клиента.
+
+    Имена с хешем из манифеста кэшируются навсегда (immutable), остальные —
+    на STATIC_MAX_AGE секунд. В DEBUG файлы берутся из finders, как у
+    runserver.
+    """
+    if settings.DEBUG:
+        return serve(request, path, insecure=True)
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(fullpath):
+        raise Http404
+    filename, encoding, variants = negotiate(
+        fullpath, request.META.get('HTTP_ACCEPT_ENCODING', '')
+    )
+    stat = os.stat(filename)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                              stat.st_mtime, stat.st_size):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(open(filename, 'rb'))
+        response['Content-Type'] = content_type(fullpath)
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding is not None:
+            response['Content-Encoding'] = encoding
+    if variants:
+        patch_vary_headers(response, ['Accept-Encoding'])
+    if path in hashed_names():
+        patch_cache_control(
+            response, public=True, max_age=365 * 24 * 60 * 60, immutable=True
+        )
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.STATIC_MAX_AGE
+        )
+    return response
@@ -0,0 +1,21 @@
+import os
+
+from django.conf import settings
+from django.template.loader import get_template
+
+
+def project_templates(subdir=''):
+    root = os.path.join(settings.TEMPLATES_DIR, subdir)
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if filename.endswith('.html'):
+                path = os.path.join(dirpath, filename)
+                yield os.path.relpath(path, settings.TEMPLATES_DIR)
+
+
+def warm_templates():
+    """Компилирует шаблоны проекта в кэш загрузчика до первого запроса."""
+    names = list(project_templates())
+    for name in names:
+        get_template(name)
+    return names
@@ -1,17 +1,135 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME, ActionForm
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.db.models import Count, Max
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
 
-from .models import Comment, Follow, Group, Post
+from core.pagecache import invalidate_pages
+from yatube.settings import ADMIN_BATCH_SIZE
+
+from .deletion import delete_in_batches
+from .groups import invalidate_group_summaries
+from .models import ArchivedPost, Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор, не делающий COUNT(*) по всей таблице без фильтров."""
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if query.where:
+            return super().count
+        return self.object_list.aggregate(Max('pk'))['pk__max'] or 0
+
+
+class PostActionForm(ActionForm):
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.all(),
+        required=False,
+        label='Группа'
+    )
+    no_group = forms.BooleanField(required=False, label='Без группы')
+
+
+def chunked(pks, size=ADMIN_BATCH_SIZE):
+    for start in range(0, len(pks), size):
+        yield pks[start:start + size]
 
 
 class PostAdmin(admin.ModelAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group')
-    list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    action_form = PostActionForm
+    actions = ('reassign_group', 'delete_by_author')
+
+    def get_search_results(self, request, queryset, search_term):
+        """Число ищется по pk, «@имя» — по автору, остальное — по тексту."""
+        term = search_term.strip()
+        if term.isdigit():
+            return queryset.filter(pk=int(term)), False
+        if term.startswith('@'):
+            return queryset.filter(author__username=term[1:]), False
+        return super().get_search_results(request, queryset, search_term)
+
+    def reassign_group(self, request, queryset):
+        group_id = request.POST.get('group') or None
+        if (group_id is None) == (not request.POST.get('no_group')):
+            self.message_user(
+                request,
+                'Выберите группу или отметьте «Без группы»',
+                messages.ERROR
+            )
+            return
+        pks = list(queryset.values_list('pk', flat=True))
+        old_group_ids = set(queryset.values_list('group_id', flat=True))
+        for chunk in chunked(pks):
+            Post.objects.filter(pk__in=chunk).update(group_id=group_id)
+        invalidate_group_summaries(group_id, *old_group_ids)
+        invalidate_pages(
+            'posts',
+            *(f'group:{pk}' for pk in {group_id, *old_group_ids}),
+            *(f'post:{pk}' for pk in pks)
+        )
+        self.message_user(
+            request,
+            f'Группа изменена у постов: {len(pks)}',
+            messages.SUCCESS
+        )
+    reassign_group.short_description = 'Перенести в выбранную группу'
+    reassign_group.allowed_permissions = ('change',)
+
+    def delete_by_author(self, request, queryset):
+        """Удаляет все посты авторов выбранных постов.
+
+        Как и delete_selected, сначала показывает страницу подтверждения;
+        удаляет только после её отправки.
+        """
+        author_ids = set(queryset.values_list('author_id', flat=True))
+        if not request.POST.get('post'):
+            authors = User.objects.filter(pk__in=author_ids).annotate(
+                posts_count=Count('posts')
+            ).order_by('username')
+            request.current_app = self.admin_site.name
+            return TemplateResponse(
+                request,
+                'admin/posts/post/delete_by_author_confirmation.html',
+                {
+                    **self.admin_site.each_context(request),
+                    'title': 'Удалить все посты авторов?',
+                    'opts': self.model._meta,
+                    'authors': authors,
+                    'total': sum(author.posts_count for author in authors),
+                    'queryset': queryset,
+                    'action_checkbox_name': ACTION_CHECKBOX_NAME,
+                    'media': self.media,
+                }
+            )
+        deleted = sum(delete_in_batches(
+            Post.objects.filter(author_id__in=author_ids),
+            batch_size=ADMIN_BATCH_SIZE
+        ))
+        self.message_user(
+            request,
+            f'Удалено постов: {deleted}',
+            messages.SUCCESS
+        )
+    delete_by_author.short_description = 'Удалить все посты их авторов'
+    delete_by_author.allowed_permissions = ('delete',)
 
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
 admin.site.register(Comment)
 admin.site.register(Follow)
+admin.site.register(ArchivedPost)
@@ -0,0 +1,103 @@
+import datetime as dt
+
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from yatube.settings import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+
+POST_FIELDS = ('id', 'text', 'pub_date', 'author_id', 'group_id', 'image')
+COMMENT_FIELDS = ('id', 'text', 'created', 'author_id', 'post_id')
+
+
+def archive_cutoff(days=ARCHIVE_AFTER_DAYS):
+    return timezone.now() - dt.timedelta(days=days)
+
+
+def archive_posts(before, batch_size=ARCHIVE_BATCH_SIZE):
+    """Переносит посты старше before вместе с комментариями в архив.
+
+    Каждая порция переносится в своей транзакции; отдаёт число
+    перенесённых в порции постов.
+    """
+    pks = Post.objects.filter(
+        pub_date__lt=before
+    ).order_by('pub_date').values_list('pk', flat=True)
+    while True:
+        chunk = list(pks[:batch_size])
+        if not chunk:
+            return
+        with transaction.atomic():
+            ArchivedPost.objects.bulk_create(
+                ArchivedPost(**values)
+                for values in Post.objects.filter(
+                    pk__in=chunk
+                ).values(*POST_FIELDS)
+            )
+            ArchivedComment.objects.bulk_create(
+                ArchivedComment(**values)
+                for values in Comment.objects.filter(
+                    post_id__in=chunk
+                ).values(*COMMENT_FIELDS)
+            )
+            Comment.objects.filter(post_id__in=chunk).delete()
+            Post.objects.filter(pk__in=chunk).delete()
+        yield len(chunk)
+
+
+def get_post_or_404(post_id):
+    """Ищет пост в основной таблице, а если его там нет — в архиве."""
+    post = Post.objects.select_related('author', 'group').filter(
+        pk=post_id
+    ).first()
+    if post is None:
+        post = ArchivedPost.objects.select_related('author', 'group').filter(
+            pk=post_id
+        ).first()
+    if post is None:
+        raise Http404('No Post matches the given query.')
+    return post
+
+
+class PostChain:
+    """Несколько querysets постов как одна последовательность для Paginator.
+
+    Архив читается только для страниц, которые выходят за пределы
+    основной таблицы.
+    """
+
+    def __init__(self, *querysets):
+        self.querysets = querysets
+
+    @cached_property
+    def counts(self):
+        return [queryset.count() for queryset in self.querysets]
+
+    def count(self):
+        return sum(self.counts)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+        result = []
+        for queryset, size in zip(self.querysets, self.counts):
+            if start < size and stop > 0:
+                result.extend(queryset[max(start, 0):min(stop, size)])
+            start -= size
+            stop -= size
+        return result
+
+
+def author_posts(author):
+    return PostChain(
+        Post.objects.filter(author=author).select_related('group'),
+        ArchivedPost.objects.filter(author=author).select_related('group')
+    )
@@ -0,0 +1,79 @@
+import atexit
+import logging
+import threading
+
+from django.db import DatabaseError, close_old_connections
+
+from core.pagecache import invalidate_pages
+from yatube.settings import COMMENTS_BATCH_SIZE, COMMENTS_FLUSH_INTERVAL
+
+from .models import Comment
+
+logger = logging.getLogger(__name__)
+
+
+class CommentWriter:
+    """Отложенная запись комментариев пачками через bulk_create.
+
+    Комментарии копятся в памяти процесса и сохраняются фоновым потоком
+    раз в interval секунд или сразу, как наберётся batch_size штук. Пока
+    комментарий не записан, он отдаётся через pending_for.
+    """
+
+    def __init__(self, batch_size=COMMENTS_BATCH_SIZE,
+                 interval=COMMENTS_FLUSH_INTERVAL, background=True):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.background = background
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pending = []
+        self.thread = None
+
+    def add(self, comment):
+        with self.lock:
+            self.pending.append(comment)
+            full = len(self.pending) >= self.batch_size
+            if self.background and self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name='comment-writer', daemon=True
+                )
+                self.thread.start()
+                atexit.register(self.flush)
+        if full:
+            self.wakeup.set()
+
+    def pending_for(self, post_id):
+        with self.lock:
+            return [
+                comment for comment in self.pending
+                if comment.post_id == post_id
+            ]
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if not batch:
+            return 0
+        try:
+            Comment.objects.bulk_create(batch, batch_size=self.batch_size)
+        except DatabaseError:
+            logger.exception('Comment batch failed, saving one by one')
+            for comment in batch:
+                try:
+                    comment.save()
+                except DatabaseError:
+                    logger.exception('Comment for post %s lost',
+                                     comment.post_id)
+        invalidate_pages(*{f'post:{comment.post_id}' for comment in batch})
+        return len(batch)
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+
+comment_writer = CommentWriter()
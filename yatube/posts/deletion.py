@@ -0,0 +1,55 @@
+import time
+
+from django.db import transaction
+from django.db.models import Q
+
+from yatube.settings import DELETE_BATCH_SIZE
+
+from .models import ArchivedComment, ArchivedPost, Comment, Follow, Post
+
+
+def delete_in_batches(queryset, batch_size=DELETE_BATCH_SIZE, pause=0):
+    """Удаляет записи порциями, каждую в отдельной короткой транзакции.
+
+    Отдаёт размер каждой удалённой порции; между порциями можно сделать
+    паузу, чтобы запись в базу успевали выполнить обычные запросы.
+    """
+    model = queryset.model
+    pks = queryset.order_by().values_list('pk', flat=True)
+    while True:
+        chunk = list(pks[:batch_size])
+        if not chunk:
+            return
+        with transaction.atomic():
+            model.objects.filter(pk__in=chunk).delete()
+        yield len(chunk)
+        if pause:
+            time.sleep(pause)
+
+
+def delete_user_in_batches(user, batch_size=DELETE_BATCH_SIZE, pause=0):
+    """Удаляет пользователя и всё, что от него зависит, порциями.
+
+    Отдаёт пары (шаг, удалено на шаге). Если процесс прервать, повторный
+    запуск продолжит с того места, где остановился.
+    """
+    steps = (
+        ('comments', Comment.objects.filter(author=user)),
+        ('post comments', Comment.objects.filter(post__author=user)),
+        ('follows', Follow.objects.filter(Q(user=user) | Q(author=user))),
+        ('posts', Post.objects.filter(author=user)),
+        (
+            'archived comments',
+            ArchivedComment.objects.filter(
+                Q(author=user) | Q(post__author=user)
+            )
+        ),
+        ('archived posts', ArchivedPost.objects.filter(author=user)),
+    )
+    for step, queryset in steps:
+        deleted = 0
+        for count in delete_in_batches(queryset, batch_size, pause):
+            deleted += count
+            yield step, deleted
+    user.delete()
+    yield 'user', 1
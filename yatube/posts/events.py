@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import deque
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from yatube.settings import (POST_EVENTS_BROKER, POST_EVENTS_BUFFER,
+                             POST_EVENTS_MAX_STREAMS,
+                             POST_EVENTS_POLL_INTERVAL)
+
+
+class LocalBroker:
+    """Шина событий о новых постах внутри одного процесса."""
+
+    def __init__(self, size=POST_EVENTS_BUFFER):
+        self.condition = threading.Condition()
+        self.events = deque(maxlen=size)
+        self.seq = 0
+
+    def publish(self, author_id):
+        with self.condition:
+            self.seq += 1
+            self.events.append((self.seq, author_id))
+            self.condition.notify_all()
+
+    def latest(self):
+        return self.seq
+
+    def since(self, seq):
+        with self.condition:
+            return [event for event in self.events if event[0] > seq]
+
+    def wait(self, seq, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.seq > seq, timeout)
+        return self.since(seq)
+
+
+class CacheBroker:
+    """Шина событий через кэш default; подписчики опрашивают счётчик в нём.
+
+    События видят все воркеры, только если кэш общий (Redis, Memcached):
+    LocMemCache у каждого процесса свой, поэтому с ним брокер не создаётся.
+    """
+    key = 'post_events'
+
+    def __init__(self, size=POST_EVENTS_BUFFER):
+        if isinstance(caches['default'], LocMemCache):
+            raise ImproperlyConfigured(
+                'CacheBroker needs a cache shared between processes'
+            )
+        self.size = size
+
+    def publish(self, author_id):
+        cache.add(f'{self.key}:seq', 0, None)
+        seq = cache.incr(f'{self.key}:seq')
+        cache.set(f'{self.key}:{seq}', author_id)
+
+    def latest(self):
+        return cache.get(f'{self.key}:seq', 0)
+
+    def since(self, seq):
+        latest = self.latest()
+        numbers = range(max(seq + 1, latest - self.size + 1), latest + 1)
+        events = cache.get_many([f'{self.key}:{n}' for n in numbers])
+        return [
+            (n, events[f'{self.key}:{n}'])
+            for n in numbers if f'{self.key}:{n}' in events
+        ]
+
+    def wait(self, seq, timeout):
+        deadline = time.monotonic() + timeout
+        while self.latest() <= seq and time.monotonic() < deadline:
+            time.sleep(POST_EVENTS_POLL_INTERVAL)
+        return self.since(seq)
+
+
+broker = import_string(POST_EVENTS_BROKER)()
+
+
+class StreamLimit:
+    """Ограничивает число открытых потоков событий в процессе.
+
+    Каждый поток держит свой поток выполнения, пока клиент подключён.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.open = 0
+
+    def acquire(self):
+        with self.lock:
+            if self.open >= self.limit:
+                return False
+            self.open += 1
+            return True
+
+    def release(self):
+        with self.lock:
+            self.open -= 1
+
+
+streams = StreamLimit(POST_EVENTS_MAX_STREAMS)
+
+
+class LimitedStream:
+    """Содержимое ответа, которое при закрытии освобождает место в лимите.
+
+    Django закрывает его вместе с ответом, даже если поток не читали.
+    """
+
+    def __init__(self, stream, limit):
+        self.stream = stream
+        self.limit = limit
+        self.closed = False
+
+    def __iter__(self):
+        return self.stream
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.stream.close()
+            self.limit.release()
+
+
+def event_stream(seq, authors, heartbeat, duration):
+    """Поток server-sent events с числом новых постов после seq.
+
+    authors — множество id авторов, посты которых учитываются, или None
+    для всех постов. Поток закрывается через duration секунд, и браузер
+    переподключается с Last-Event-ID.
+    """
+    yield f'retry: {int(heartbeat * 1000)}\n\n'
+    deadline = time.monotonic() + duration
+    new_posts = 0
+    while time.monotonic() < deadline:
+        events = broker.wait(seq, heartbeat)
+        if not events:
+            yield ': ping\n\n'
+            continue
+        seq = events[-1][0]
+        new_posts += sum(
+            1 for _, author_id in events
+            if authors is None or author_id in authors
+        )
+        if new_posts:
+            yield f'id: {seq}\nevent: posts\ndata: {new_posts}\n\n'
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Subquery
+
+from core.metrics import cache_result
+from yatube.settings import GROUP_SUMMARY_TIMEOUT
+
+from .models import Group, Post
+
+GROUP_IDS_KEY = 'group_ids'
+
+
+def summary_key(group_id):
+    return f'group_summary:{group_id}'
+
+
+def annotated_groups():
+    """Группы с числом постов и последним постом одним запросом."""
+    latest = Post.objects.filter(group=OuterRef('pk')).order_by('-pub_date')
+    return Group.objects.annotate(
+        post_count=Count('post'),
+        latest_post_id=Subquery(latest.values('pk')[:1]),
+        latest_post_text=Subquery(latest.values('text')[:1]),
+        latest_pub_date=Subquery(latest.values('pub_date')[:1]),
+    )
+
+
+def group_summaries():
+    """Сводки всех групп; из базы читаются только отсутствующие в кэше."""
+    group_ids = cache.get(GROUP_IDS_KEY)
+    if group_ids is None:
+        group_ids = list(
+            Group.objects.order_by('title').values_list('pk', flat=True)
+        )
+        cache.set(GROUP_IDS_KEY, group_ids, GROUP_SUMMARY_TIMEOUT)
+    cached = cache.get_many([summary_key(pk) for pk in group_ids])
+    missing = [pk for pk in group_ids if summary_key(pk) not in cached]
+    cache_result('group_summary', hits=len(cached), misses=len(missing))
+    if missing:
+        fresh = {
+            summary_key(group.pk): group
+            for group in annotated_groups().filter(pk__in=missing)
+        }
+        cache.set_many(fresh, GROUP_SUMMARY_TIMEOUT)
+        cached.update(fresh)
+    return [
+        cached[summary_key(pk)] for pk in group_ids
+        if summary_key(pk) in cached
+    ]
+
+
+def invalidate_group_summaries(*group_ids):
+    cache.delete_many([
+        summary_key(pk) for pk in group_ids if pk is not None
+    ])
+
+
+def invalidate_group_ids():
+    cache.delete(GROUP_IDS_KEY)
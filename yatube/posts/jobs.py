@@ -0,0 +1,37 @@
+from core.scheduler import periodic
+
+from .archive import archive_cutoff, archive_posts
+from .models import ArchivedPost, Post
+
+
+@periodic
+def prune_thumbnails():
+    """Удаляет миниатюры картинок, на которые больше не ссылаются посты.
+
+    После этого из хранилища ключей sorl-thumbnail убираются записи
+    о файлах, которых уже нет на диске.
+    """
+    from sorl.thumbnail import default
+    from sorl.thumbnail.conf import settings as thumbnail_settings
+    images = set(Post.objects.exclude(image='').values_list(
+        'image', flat=True
+    ))
+    images.update(ArchivedPost.objects.exclude(image='').values_list(
+        'image', flat=True
+    ))
+    pruned = 0
+    for key in list(default.kvstore._find_keys(identity='image')):
+        image_file = default.kvstore._get(key)
+        if image_file is None or image_file.name in images:
+            continue
+        if image_file.name.startswith(thumbnail_settings.THUMBNAIL_PREFIX):
+            continue
+        default.kvstore.delete(image_file)
+        pruned += 1
+    default.kvstore.cleanup()
+    return f'pruned images: {pruned}'
+
+
+@periodic
+def archive_old_posts():
+    return f'archived posts: {sum(archive_posts(archive_cutoff()))}'
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from yatube.settings import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+
+from ...archive import archive_cutoff, archive_posts
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые посты и их комментарии в архивные таблицы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=ARCHIVE_AFTER_DAYS,
+            help='Архивировать посты старше этого числа дней.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=ARCHIVE_BATCH_SIZE
+        )
+
+    def handle(self, days, batch_size, **options):
+        archived = 0
+        for count in archive_posts(archive_cutoff(days), batch_size):
+            archived += count
+            self.stdout.write(f'archived: {archived}')
+        self.stdout.write(
+            self.style.SUCCESS(f'Перенесено в архив постов: {archived}')
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from yatube.settings import DELETE_BATCH_SIZE
+
+from ...deletion import delete_user_in_batches
+from ...models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет пользователя вместе с постами, комментариями и подписками '
+        'порциями, не блокируя базу надолго. Можно перезапускать.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument(
+            '--batch-size', type=int, default=DELETE_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Пауза в секундах между порциями.'
+        )
+
+    def handle(self, username, batch_size, pause, **options):
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f'Пользователь {username} не найден')
+        for step, deleted in delete_user_in_batches(user, batch_size, pause):
+            self.stdout.write(f'{step}: {deleted}')
+        self.stdout.write(self.style.SUCCESS(f'{username} удалён'))
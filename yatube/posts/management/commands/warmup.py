@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from core.warmup import warm_templates
+
+from ...warmup import warm_pages, warm_thumbnails, warmup_urls
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогревает кэши после выкладки: компилирует шаблоны, отрисовывает '
+        'первые страницы лент и создаёт недостающие миниатюры. Кэш страниц '
+        'воркеров прогревается запросами на --base-url; без него страницы '
+        'рисуются в этом процессе и попадают к воркерам, только если '
+        'бэкенд кэша общий.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=3)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--profiles', type=int, default=10)
+        parser.add_argument('--thumbnails', type=int, default=200)
+        parser.add_argument(
+            '--base-url',
+            help='Адрес запущенного сайта, например http://127.0.0.1:8000.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=1,
+            help='Сколько раз запросить каждую страницу: при кэше в '
+                 'памяти процесса — не меньше числа воркеров.'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Сколько запросов к базе выполнять одновременно.'
+        )
+
+    def handle(self, pages, groups, profiles, thumbnails, base_url, repeat,
+               concurrency, **options):
+        templates = warm_templates()
+        self.stdout.write(f'Шаблонов скомпилировано: {len(templates)}')
+        urls = warmup_urls(pages, groups, profiles) * repeat
+        for url, status in warm_pages(urls, concurrency, base_url):
+            self.stdout.write(f'{status} {url}')
+        made = sum(1 for _ in warm_thumbnails(thumbnails, concurrency))
+        self.stdout.write(self.style.SUCCESS(f'Миниатюр проверено: {made}'))
@@ -15,7 +15,7 @@ class Group(models.Model):
 
 class Post(models.Model):
     text = models.TextField()
-    pub_date = models.DateTimeField(auto_now_add=True)
+    pub_date = models.DateTimeField(auto_now_add=True, db_index=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -33,6 +33,8 @@ class Post(models.Model):
         blank=True
     )
 
+    is_archived = False
+
     class Meta:
         ordering = ('-pub_date',)
 
@@ -66,3 +68,55 @@ class Follow(models.Model):
         on_delete=models.CASCADE,
         related_name='following'
     )
+
+
+class ArchivedPost(models.Model):
+    """Старый пост, перенесённый из основной таблицы командой archive_posts.
+
+    Первичный ключ совпадает с ключом исходного поста, поэтому ссылки на
+    пост продолжают работать.
+    """
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField()
+    pub_date = models.DateTimeField()
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts'
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='archived_posts'
+    )
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        blank=True
+    )
+
+    is_archived = True
+
+    class Meta:
+        ordering = ('-pub_date',)
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField()
+    created = models.DateTimeField()
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments'
+    )
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments'
+    )
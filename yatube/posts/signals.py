@@ -0,0 +1,85 @@
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from core.pagecache import invalidate_pages
+
+from .events import broker
+from .groups import invalidate_group_ids, invalidate_group_summaries
+from .models import Comment, Group, Post
+from .tasks import make_post_thumbnail
+
+
+@receiver(post_save, sender=Post)
+def publish_new_post(sender, instance, created, **kwargs):
+    """Сообщает о посте после коммита: откаченный пост не виден."""
+    if created:
+        author_id = instance.author_id
+        transaction.on_commit(lambda: broker.publish(author_id))
+
+
+@receiver(post_save, sender=Post)
+def queue_post_thumbnail(sender, instance, **kwargs):
+    if instance.image:
+        make_post_thumbnail.enqueue(
+            instance.pk, key=f'thumbnail:{instance.image.name}'
+        )
+
+
+@receiver(post_init, sender=Post)
+def remember_post_group(sender, instance, **kwargs):
+    instance._loaded_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    invalidate_pages(
+        'posts',
+        f'post:{instance.pk}',
+        f'user:{instance.author_id}',
+        f'group:{instance.group_id}',
+        f'group:{instance._loaded_group_id}',
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    invalidate_pages(f'post:{instance.post_id}')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_groups(sender, instance, **kwargs):
+    invalidate_group_summaries(instance.group_id, instance._loaded_group_id)
+    instance._loaded_group_id = instance.group_id
+
+
+@receiver(pre_delete, sender=Group)
+def remember_group_posts(sender, instance, **kwargs):
+    instance._post_ids = list(
+        Post.objects.filter(group=instance).values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_groups(sender, instance, created=False, **kwargs):
+    """Сбрасывает страницы группы и всех её постов.
+
+    Ссылки на группу есть на каждой странице с её постами. При удалении
+    у постов обнуляется group одним UPDATE без сигналов Post, поэтому их
+    id запоминаются заранее, в pre_delete.
+    """
+    invalidate_group_ids()
+    invalidate_group_summaries(instance.pk)
+    post_ids = getattr(instance, '_post_ids', None)
+    if post_ids is None and not created:
+        post_ids = Post.objects.filter(group=instance).values_list(
+            'pk', flat=True
+        )
+    invalidate_pages(
+        f'group:{instance.pk}', *(f'post:{pk}' for pk in post_ids or ())
+    )
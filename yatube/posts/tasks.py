@@ -0,0 +1,15 @@
+from core.tasks import task
+
+from .models import Post
+from .warmup import THUMBNAIL_GEOMETRY, THUMBNAIL_OPTIONS
+
+
+@task(queue='thumbnails')
+def make_post_thumbnail(post_id):
+    """Создаёт миниатюру картинки поста, пока её не запросила лента."""
+    from sorl.thumbnail import get_thumbnail
+    image = Post.objects.filter(pk=post_id).values_list(
+        'image', flat=True
+    ).first()
+    if image:
+        get_thumbnail(image, THUMBNAIL_GEOMETRY, **THUMBNAIL_OPTIONS)
@@ -0,0 +1,133 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.admin import EstimatedCountPaginator
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='test-admin',
+            email='admin@example.com',
+            password='test-password'
+        )
+        cls.author = User.objects.create_user(username='test-author')
+        cls.another_author = User.objects.create_user(
+            username='test-another_author'
+        )
+        cls.group = Group.objects.create(
+            title='test-title',
+            slug='test-slug',
+            description='test-description'
+        )
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+        self.post = Post.objects.create(text='test-text', author=self.author)
+        self.another_post = Post.objects.create(
+            text='test-another_text',
+            author=self.another_author
+        )
+
+    def test_changelist_opens(self):
+        response = self.admin_client.get(
+            reverse('admin:posts_post_changelist')
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_reassign_group_action(self):
+        self.admin_client.post(
+            reverse('admin:posts_post_changelist'),
+            {
+                'action': 'reassign_group',
+                'group': self.group.pk,
+                '_selected_action': [self.post.pk],
+            }
+        )
+        self.post.refresh_from_db()
+        self.another_post.refresh_from_db()
+        self.assertEqual(self.post.group, self.group)
+        self.assertIsNone(self.another_post.group)
+
+    def test_reassign_group_requires_explicit_choice(self):
+        self.post.group = self.group
+        self.post.save()
+        url = reverse('admin:posts_post_changelist')
+        data = {
+            'action': 'reassign_group',
+            '_selected_action': [self.post.pk],
+        }
+        response = self.admin_client.post(url, data, follow=True)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.group, self.group)
+        self.assertContains(response, 'Выберите группу')
+        self.admin_client.post(url, {**data, 'no_group': 'on'})
+        self.post.refresh_from_db()
+        self.assertIsNone(self.post.group)
+
+    def test_delete_by_author_action(self):
+        Post.objects.create(text='test-second_text', author=self.author)
+        Comment.objects.create(
+            text='test-comment',
+            author=self.another_author,
+            post=self.post
+        )
+        url = reverse('admin:posts_post_changelist')
+        data = {
+            'action': 'delete_by_author',
+            '_selected_action': [self.post.pk],
+        }
+        response = self.admin_client.post(url, data)
+        self.assertContains(response, 'всего постов: 2')
+        self.assertEqual(Post.objects.filter(author=self.author).count(), 2)
+        self.admin_client.post(url, {**data, 'post': 'yes'})
+        self.assertFalse(Post.objects.filter(author=self.author).exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertTrue(
+            Post.objects.filter(pk=self.another_post.pk).exists()
+        )
+
+    def test_actions_require_permissions(self):
+        viewer = User.objects.create_user(username='viewer', is_staff=True)
+        viewer.user_permissions.add(
+            Permission.objects.get(codename='view_post')
+        )
+        self.client.force_login(viewer)
+        url = reverse('admin:posts_post_changelist')
+        for action in ('delete_by_author', 'reassign_group'):
+            with self.subTest(action=action):
+                self.client.post(url, {
+                    'action': action,
+                    'group': self.group.pk,
+                    '_selected_action': [self.post.pk],
+                    'post': 'yes',
+                })
+                self.post.refresh_from_db()
+                self.assertIsNone(self.post.group)
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_search_by_author(self):
+        response = self.admin_client.get(
+            reverse('admin:posts_post_changelist'),
+            {'q': f'@{self.author.username}'}
+        )
+        self.assertEqual(
+            list(response.context['cl'].result_list),
+            [self.post]
+        )
+
+    def test_paginator_estimates_unfiltered_count(self):
+        paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+        self.assertEqual(paginator.count, self.another_post.pk)
+        paginator = EstimatedCountPaginator(
+            Post.objects.filter(author=self.author), 10
+        )
+        self.assertEqual(paginator.count, 1)
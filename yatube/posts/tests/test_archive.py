@@ -0,0 +1,62 @@
+import datetime as dt
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import ArchivedComment, ArchivedPost, Comment, Post
+
+User = get_user_model()
+
+
+class ArchivePostsTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='test-author')
+        self.old_post = Post.objects.create(
+            text='test-old_text', author=self.author
+        )
+        Post.objects.filter(pk=self.old_post.pk).update(
+            pub_date=timezone.now() - dt.timedelta(days=400)
+        )
+        self.comment = Comment.objects.create(
+            text='test-comment', author=self.author, post=self.old_post
+        )
+        self.new_post = Post.objects.create(
+            text='test-new_text', author=self.author
+        )
+        call_command('archive_posts', days=365, stdout=StringIO())
+
+    def test_old_posts_moved_to_archive(self):
+        self.assertFalse(Post.objects.filter(pk=self.old_post.pk).exists())
+        self.assertFalse(Comment.objects.exists())
+        archived = ArchivedPost.objects.get(pk=self.old_post.pk)
+        self.assertEqual(archived.text, self.old_post.text)
+        self.assertEqual(
+            ArchivedComment.objects.get().text, self.comment.text
+        )
+        self.assertTrue(Post.objects.filter(pk=self.new_post.pk).exists())
+
+    def test_post_detail_reads_archive(self):
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.old_post.pk})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['post'].text, self.old_post.text)
+        self.assertEqual(response.context['posts_count'], 2)
+        self.assertEqual(
+            response.context['comments'][0].text, self.comment.text
+        )
+
+    def test_profile_lists_archived_posts_after_recent(self):
+        response = self.client.get(
+            reverse('posts:profile', kwargs={'username': 'test-author'})
+        )
+        page = response.context['page_obj']
+        self.assertEqual(response.context['post_count'], 2)
+        self.assertEqual(
+            [post.text for post in page],
+            [self.new_post.text, self.old_post.text]
+        )
@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.comments import CommentWriter
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+class CommentWriteBehindTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='test-author')
+        cls.post = Post.objects.create(text='test-text', author=cls.author)
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.writer = CommentWriter(batch_size=2, background=False)
+        patchers = (
+            mock.patch('posts.views.COMMENTS_WRITE_BEHIND', True),
+            mock.patch('posts.views.comment_writer', self.writer),
+        )
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def add_comment(self, text):
+        self.author_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.pk}),
+            data={'text': text}
+        )
+
+    def test_pending_comment_is_shown_to_author(self):
+        self.add_comment('test-comment')
+        self.assertFalse(Comment.objects.exists())
+        response = self.author_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        self.assertEqual(response.context['comments'][0].text, 'test-comment')
+
+    def test_flush_saves_batch(self):
+        self.add_comment('test-comment1')
+        self.add_comment('test-comment2')
+        self.assertEqual(self.writer.flush(), 2)
+        self.assertEqual(
+            set(Comment.objects.values_list('text', flat=True)),
+            {'test-comment1', 'test-comment2'}
+        )
+        self.assertEqual(self.writer.pending_for(self.post.pk), [])
+
+    def test_comment_to_missing_post_returns_404(self):
+        response = self.author_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': 0}),
+            data={'text': 'test-comment'}
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.writer.pending, [])
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.deletion import delete_user_in_batches
+from posts.models import Comment, Follow, Post
+
+User = get_user_model()
+
+
+class DeleteUserInBatchesTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='test-author')
+        self.reader = User.objects.create_user(username='test-reader')
+        for i in range(5):
+            post = Post.objects.create(
+                text=f'test-text{i}', author=self.author
+            )
+            Comment.objects.create(
+                text='test-comment', author=self.reader, post=post
+            )
+        self.reader_post = Post.objects.create(
+            text='test-reader_text', author=self.reader
+        )
+        Comment.objects.create(
+            text='test-author_comment',
+            author=self.author,
+            post=self.reader_post
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+
+    def test_deletes_everything_in_batches(self):
+        progress = list(delete_user_in_batches(self.author, batch_size=2))
+        self.assertIn(('posts', 2), progress)
+        self.assertIn(('posts', 5), progress)
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+        self.assertFalse(Post.objects.filter(author=self.author).exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertTrue(
+            Post.objects.filter(pk=self.reader_post.pk).exists()
+        )
+
+    def test_interrupted_deletion_can_be_resumed(self):
+        steps = delete_user_in_batches(self.author, batch_size=1)
+        next(steps)
+        steps.close()
+        self.assertTrue(User.objects.filter(pk=self.author.pk).exists())
+        list(delete_user_in_batches(self.author, batch_size=1))
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+
+    def test_command_reports_progress(self):
+        out = StringIO()
+        call_command(
+            'delete_user', self.author.username, batch_size=2, stdout=out
+        )
+        self.assertIn('posts: 5', out.getvalue())
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
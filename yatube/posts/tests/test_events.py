@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from posts.events import (CacheBroker, LocalBroker, broker, event_stream,
+                          streams)
+from posts.models import Post
+
+User = get_user_model()
+
+
+class LocalBrokerTests(TestCase):
+    def test_wait_returns_published_events(self):
+        local_broker = LocalBroker(size=2)
+        seq = local_broker.latest()
+        for author_id in (1, 2, 3):
+            local_broker.publish(author_id)
+        self.assertEqual(local_broker.wait(seq, timeout=0), [(2, 2), (3, 3)])
+
+    def test_wait_times_out_without_events(self):
+        local_broker = LocalBroker()
+        self.assertEqual(local_broker.wait(0, timeout=0.01), [])
+
+
+class CacheBrokerTests(TestCase):
+    def test_refuses_process_local_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            CacheBroker()
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }})
+    def test_accepts_other_backends(self):
+        self.assertEqual(CacheBroker(size=5).size, 5)
+
+
+class PostEventsTests(TransactionTestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='test-author')
+        self.another_author = User.objects.create_user(
+            username='test-another_author'
+        )
+
+    def test_new_post_is_published(self):
+        seq = broker.latest()
+        Post.objects.create(text='test-text', author=self.author)
+        self.assertEqual(broker.since(seq), [(seq + 1, self.author.pk)])
+
+    def test_rolled_back_post_is_not_published(self):
+        seq = broker.latest()
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                Post.objects.create(text='test-text', author=self.author)
+                self.assertEqual(broker.since(seq), [])
+                raise ValueError
+        self.assertEqual(broker.since(seq), [])
+
+    def test_stream_counts_only_followed_authors(self):
+        seq = broker.latest()
+        Post.objects.create(text='test-text', author=self.another_author)
+        Post.objects.create(text='test-text', author=self.author)
+        stream = event_stream(
+            seq, {self.author.pk}, heartbeat=0.01, duration=0.05
+        )
+        messages = list(stream)
+        self.assertIn(
+            f'id: {seq + 2}\nevent: posts\ndata: 1\n\n', messages
+        )
+
+    def test_events_url_streams(self):
+        response = self.client.get(reverse('posts:post_events'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            next(response.streaming_content), b'retry: 15000\n\n'
+        )
+        response.close()
+
+    def test_streams_over_limit_are_refused(self):
+        limit = streams.limit
+        streams.limit = streams.open + 1
+        self.addCleanup(setattr, streams, 'limit', limit)
+        url = reverse('posts:post_events')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        refused = self.client.get(url)
+        self.assertEqual(refused.status_code, 503)
+        self.assertIn('Retry-After', refused)
+        response.close()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response.close()
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.pagecache import page_cache
+from posts.groups import group_summaries
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class GroupIndexTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='test-author')
+        cls.group = Group.objects.create(
+            title='test-title',
+            slug='test-slug',
+            description='test-description'
+        )
+        cls.another_group = Group.objects.create(
+            title='test-another_title',
+            slug='test-another_slug',
+            description='test-description'
+        )
+
+    def setUp(self):
+        cache.clear()
+        page_cache().clear()
+        self.post = Post.objects.create(
+            text='test-first_text', author=self.author, group=self.group
+        )
+        self.latest_post = Post.objects.create(
+            text='test-latest_text', author=self.author, group=self.group
+        )
+
+    def summaries(self):
+        return {group.slug: group for group in group_summaries()}
+
+    def test_group_index_shows_counts_and_latest_post(self):
+        response = self.client.get(reverse('posts:group_index'))
+        groups = {group.slug: group for group in response.context['groups']}
+        self.assertEqual(groups['test-slug'].post_count, 2)
+        self.assertEqual(
+            groups['test-slug'].latest_post_id, self.latest_post.pk
+        )
+        self.assertEqual(groups['test-another_slug'].post_count, 0)
+        self.assertContains(response, self.latest_post.text)
+
+    def test_summaries_are_cached(self):
+        group_summaries()
+        with self.assertNumQueries(0):
+            group_summaries()
+
+    def test_moving_post_invalidates_both_groups(self):
+        self.summaries()
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = self.another_group
+        post.save()
+        summaries = self.summaries()
+        self.assertEqual(summaries['test-slug'].post_count, 1)
+        self.assertEqual(summaries['test-another_slug'].post_count, 1)
+
+    def test_new_group_appears(self):
+        self.summaries()
+        Group.objects.create(
+            title='test-new_title', slug='test-new_slug', description='-'
+        )
+        self.assertIn('test-new_slug', self.summaries())
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.pagecache import page_cache
+from core.querybudget import QueryBudgetExceeded, query_budget
+from posts.models import Comment, Follow, Group, Post
+from posts.urls import urlpatterns
+from yatube.settings import PAGINATOR_COUNT, QUERY_BUDGETS
+
+User = get_user_model()
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='test-author')
+        cls.user = User.objects.create_user(username='test-user')
+        cls.group = Group.objects.create(
+            title='test-title',
+            slug='test-slug',
+            description='test-description'
+        )
+        for i in range(PAGINATOR_COUNT + 3):
+            cls.post = Post.objects.create(
+                text=f'test-text{i}', author=cls.author, group=cls.group
+            )
+            Comment.objects.create(
+                text='test-comment', author=cls.user, post=cls.post
+            )
+        Follow.objects.create(user=cls.user, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        page_cache().clear()
+        self.user_client = Client()
+        self.user_client.force_login(self.user)
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def requests(self):
+        post = {'post_id': self.post.pk}
+        author = {'username': self.author.username}
+        return {
+            'posts:index': (self.user_client, 'get', {}),
+            'posts:group_index': (self.user_client, 'get', {}),
+            'posts:group_list': (
+                self.user_client, 'get', {'slug': self.group.slug}
+            ),
+            'posts:profile': (self.user_client, 'get', author),
+            'posts:post_detail': (self.user_client, 'get', post),
+            'posts:post_edit': (self.author_client, 'get', post),
+            'posts:post_create': (self.user_client, 'get', {}),
+            'posts:add_comment': (self.user_client, 'post', post),
+            'posts:follow_index': (self.user_client, 'get', {}),
+            'posts:post_events': (self.user_client, 'get', {}),
+            'posts:profile_follow': (self.user_client, 'get', author),
+            'posts:profile_unfollow': (self.user_client, 'get', author),
+        }
+
+    def test_every_route_has_budget(self):
+        for pattern in urlpatterns:
+            with self.subTest(route=pattern.name):
+                self.assertIn(f'posts:{pattern.name}', QUERY_BUDGETS)
+
+    def test_routes_stay_within_budget(self):
+        for name, (client, method, kwargs) in self.requests().items():
+            with self.subTest(view=name):
+                url = reverse(name, kwargs=kwargs)
+                client.get(reverse('about:author'))
+                cache.delete('index_page')
+                with query_budget(QUERY_BUDGETS[name], label=name):
+                    getattr(client, method)(url, {'text': 'test-comment'})
+
+    def test_overrun_reports_repeated_queries(self):
+        with self.assertRaisesRegex(QueryBudgetExceeded, r'3 x SELECT'):
+            with query_budget(1):
+                for post in Post.objects.all()[:3]:
+                    post.author.username
+
+    @override_settings(DEBUG=True, QUERY_BUDGET_STRICT=True,
+                       QUERY_BUDGETS={'posts:index': 0})
+    def test_middleware_fails_view_over_budget(self):
+        with self.assertLogs('django.request', 'ERROR'):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('posts:index'))
@@ -1,8 +1,10 @@
 from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import Client, TestCase
 
+from core.pagecache import page_cache
 from posts.models import Group, Post
 
 User = get_user_model()
@@ -35,6 +37,8 @@ class PostURLTests(TestCase):
         )
 
     def setUp(self):
+        cache.clear()
+        page_cache().clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
 
@@ -8,6 +8,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
+from core.pagecache import page_cache
 from posts.models import Comment, Follow, Group, Post
 from yatube.settings import PAGINATOR_COUNT
 
@@ -77,6 +78,7 @@ class PostPagesTests(TestCase):
         self.another_author_client.force_login(self.another_author)
 
         cache.clear()
+        page_cache().clear()
 
     @classmethod
     def tearDownClass(cls):
@@ -282,6 +284,7 @@ class PostPagesTests(TestCase):
         last_post = response.context['page_obj'][0]
         self.assertEqual(last_post.text, cache_text)
         cache.clear()
+        page_cache().clear()
         response = self.client.get(reverse('posts:index'))
         last_post = response.context['page_obj'][0]
         self.assertNotEqual(last_post.text, cache_text)
@@ -335,6 +338,7 @@ class PaginatorViewsTest(TestCase):
         self.author_client.force_login(self.author)
 
         cache.clear()
+        page_cache().clear()
 
     def test_index_first_page_contains_ten_records(self):
         response = self.client.get(reverse('posts:index'))
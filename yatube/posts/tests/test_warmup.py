@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import LiveServerTestCase, TestCase, override_settings
+
+from core.localrequest import local_get
+from core.pagecache import page_cache
+from posts.models import Group, Post
+from posts.warmup import warm_pages, warm_thumbnails, warmup_urls
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class WarmupTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='test-author')
+        cls.idle_user = User.objects.create_user(username='test-idle')
+        cls.group = Group.objects.create(
+            title='test-title',
+            slug='test-slug',
+            description='test-description'
+        )
+        Post.objects.create(
+            text='test-text', author=cls.author, group=cls.group
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_warmup_urls(self):
+        self.assertEqual(
+            warmup_urls(pages=2, groups=5, profiles=5),
+            [
+                '/?page=1',
+                '/?page=2',
+                '/group/test-slug/',
+                '/profile/test-author/',
+            ]
+        )
+
+    def test_command_renders_pages(self):
+        out = StringIO()
+        with mock.patch(
+            'posts.management.commands.warmup.warm_pages',
+            side_effect=lambda urls, concurrency, base_url: [
+                (url, 200) for url in urls
+            ]
+        ):
+            call_command('warmup', pages=1, stdout=out)
+        self.assertIn('/profile/test-author/', out.getvalue())
+        self.assertIn('Миниатюр проверено: 0', out.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, TASKS_EAGER=False)
+class WarmupWorkerTests(LiveServerTestCase):
+    """Прогрев в потоках: им нужна база вне транзакции теста."""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_pages_are_requested_from_running_site(self):
+        author = User.objects.create_user(username='test-author')
+        Post.objects.create(text='test-text', author=author)
+        urls = ['/?page=1', f'/profile/{author.username}/', '/missing/']
+        self.assertEqual(
+            list(warm_pages(urls, 2, base_url=self.live_server_url + '/')),
+            [('/?page=1', 200), ('/profile/test-author/', 200),
+             ('/missing/', 404)]
+        )
+
+    def test_pages_are_rendered_in_process(self):
+        page_cache().clear()
+        author = User.objects.create_user(username='test-author')
+        Post.objects.create(text='test-text', author=author)
+        urls = ['/?page=1', f'/profile/{author.username}/', '/missing/']
+        self.assertEqual(
+            list(warm_pages(urls, 2)),
+            [('/?page=1', 200), ('/profile/test-author/', 200),
+             ('/missing/', 404)]
+        )
+        self.assertEqual(local_get('/?page=1')['X-Page-Cache'], 'hit')
+
+    def test_missing_thumbnails_are_made(self):
+        small_gif = (
+            b'\x47\x49\x46\x38\x39\x61\x02\x00'
+            b'\x01\x00\x80\x00\x00\x00\x00\x00'
+            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+            b'\x0A\x00\x3B'
+        )
+        post = Post.objects.create(
+            text='test-text',
+            author=User.objects.create_user(username='test-author'),
+            image=SimpleUploadedFile('warm.gif', small_gif, 'image/gif')
+        )
+        cache_dir = os.path.join(MEDIA_ROOT, 'cache')
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        self.assertEqual(
+            list(warm_thumbnails(limit=10, concurrency=1)),
+            [post.image.name]
+        )
+        thumbnails = [
+            name for _, _, names in os.walk(cache_dir) for name in names
+        ]
+        self.assertEqual(len(thumbnails), 1)
@@ -1,24 +1,35 @@
 from django.contrib.auth.decorators import login_required
 from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
-from yatube.settings import PAGINATOR_COUNT
+from core.metrics import cache_result
+from core.pagecache import depend_on, post_tags
+from yatube.settings import (COMMENTS_WRITE_BEHIND, PAGINATOR_COUNT,
+                             POST_EVENTS_HEARTBEAT,
+                             POST_EVENTS_STREAM_DURATION)
 
+from .archive import author_posts, get_post_or_404
+from .comments import comment_writer
+from .events import LimitedStream, broker, event_stream, streams
+from .groups import group_summaries
 from .forms import CommentForm, PostForm
-from .models import Comment, Follow, Group, Post, User
+from .models import Follow, Group, Post, User
 
 
 def index(request):
     template = 'posts/index.html'
     index = True
     post_list = cache.get('index_page')
+    cache_result('index_page', hits=bool(post_list), misses=not post_list)
     if not post_list:
-        post_list = Post.objects.select_related('group')
+        post_list = Post.objects.select_related('author', 'group')
         cache.set('index_page', post_list, timeout=20)
     paginator = Paginator(post_list, PAGINATOR_COUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    depend_on(request, 'posts', *post_tags(page_obj))
     context = {
         'page_obj': page_obj,
         'index': index
@@ -26,14 +37,23 @@ def index(request):
     return render(request, template, context)
 
 
+def group_index(request):
+    template = 'posts/group_index.html'
+    context = {
+        'groups': group_summaries(),
+    }
+    return render(request, template, context)
+
+
 def group_posts(request, slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
 
-    post_list = Post.objects.filter(group=group)
+    post_list = Post.objects.filter(group=group).select_related('author')
     paginator = Paginator(post_list, PAGINATOR_COUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    depend_on(request, f'group:{group.pk}', *post_tags(page_obj))
 
     context = {
         'group': group,
@@ -53,11 +73,12 @@ def profile(request, username):
         ).exists()
     else:
         following = False
-    post_list = Post.objects.filter(author=profile)
+    post_list = author_posts(profile)
     post_count = post_list.count()
     paginator = Paginator(post_list, PAGINATOR_COUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    depend_on(request, f'user:{profile.pk}', *post_tags(page_obj))
 
     context = {
         'profile': profile,
@@ -70,10 +91,12 @@ def profile(request, username):
 
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    post = get_object_or_404(Post, pk=post_id)
-    profile = get_object_or_404(User, username=post.author)
-    comments = Comment.objects.filter(post=post.pk)
-    posts_count = Post.objects.filter(author=profile).count()
+    post = get_post_or_404(post_id)
+    profile = post.author
+    comments = list(post.comments.select_related('author'))
+    comments += comment_writer.pending_for(post.pk)
+    posts_count = author_posts(profile).count()
+    depend_on(request, f'post:{post.pk}', f'user:{profile.pk}')
     form = CommentForm(
         request.POST or None,
         files=request.FILES or None
@@ -114,7 +137,7 @@ def post_edit(request, post_id):
     template = 'posts/create_post.html'
     post = get_object_or_404(Post, pk=post_id)
 
-    if request.user != post.author:
+    if request.user.id != post.author_id:
         return redirect('posts:post_detail', post_id)
 
     form = PostForm(
@@ -138,13 +161,17 @@ def post_edit(request, post_id):
 
 @login_required
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    if not Post.objects.filter(pk=post_id).exists():
+        raise Http404('No Post matches the given query.')
     form = CommentForm(request.POST or None)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
-        comment.post = post
-        comment.save()
+        comment.post_id = post_id
+        if COMMENTS_WRITE_BEHIND:
+            comment_writer.add(comment)
+        else:
+            comment.save()
     return redirect('posts:post_detail', post_id=post_id)
 
 
@@ -152,7 +179,9 @@ def add_comment(request, post_id):
 def follow_index(request):
     template = 'posts/follow.html'
     follow = True
-    post_list = Post.objects.filter(author__following__user=request.user)
+    post_list = Post.objects.filter(
+        author__following__user=request.user
+    ).select_related('author', 'group')
     paginator = Paginator(post_list, PAGINATOR_COUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
@@ -163,6 +192,45 @@ def follow_index(request):
     return render(request, template, context)
 
 
+def post_events(request):
+    """Сообщает открытой ленте о новых постах вместо перезагрузок.
+
+    Открытых потоков в процессе не больше POST_EVENTS_MAX_STREAMS;
+    сверх лимита — 503, и такая лента просто не узнает о новых постах.
+    """
+    authors = None
+    if request.GET.get('follow') and request.user.is_authenticated:
+        authors = set(
+            Follow.objects.filter(
+                user=request.user
+            ).values_list('author_id', flat=True)
+        )
+    last_event_id = request.META.get('HTTP_LAST_EVENT_ID', '')
+    if last_event_id.isdigit():
+        seq = int(last_event_id)
+    else:
+        seq = broker.latest()
+    if not streams.acquire():
+        response = HttpResponse(status=503)
+        response['Retry-After'] = POST_EVENTS_HEARTBEAT
+        return response
+    response = StreamingHttpResponse(
+        LimitedStream(
+            event_stream(
+                seq,
+                authors,
+                POST_EVENTS_HEARTBEAT,
+                POST_EVENTS_STREAM_DURATION
+            ),
+            streams
+        ),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
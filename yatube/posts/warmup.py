@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import requests
+from django.db import connections
+from django.db.models import Count
+from django.urls import reverse
+
+from core.localrequest import local_get
+
+from .groups import group_summaries
+from .models import Post, User
+
+# Те же параметры, что у {% thumbnail %} в шаблонах лент.
+THUMBNAIL_GEOMETRY = '960x339'
+THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+
+
+def warmup_urls(pages, groups, profiles):
+    """Первые страницы главной, самых больших групп и активных авторов."""
+    index = reverse('posts:index')
+    urls = [f'{index}?page={number}' for number in range(1, pages + 1)]
+    top_groups = sorted(
+        group_summaries(), key=lambda group: group.post_count, reverse=True
+    )
+    urls += [
+        reverse('posts:group_list', kwargs={'slug': group.slug})
+        for group in top_groups[:groups]
+    ]
+    authors = User.objects.annotate(
+        post_count=Count('posts')
+    ).filter(post_count__gt=0).order_by('-post_count')[:profiles]
+    urls += [
+        reverse('posts:profile', kwargs={'username': author.username})
+        for author in authors
+    ]
+    return urls
+
+
+def render_page(url):
+    try:
+        return url, local_get(url).status_code
+    finally:
+        connections.close_all()
+
+
+def fetch_page(base_url, url, timeout=30):
+    try:
+        return url, requests.get(base_url + url, timeout=timeout).status_code
+    except requests.RequestException as error:
+        return url, type(error).__name__
+
+
+def make_thumbnail(image_name):
+    from sorl.thumbnail import get_thumbnail
+    try:
+        get_thumbnail(image_name, THUMBNAIL_GEOMETRY, **THUMBNAIL_OPTIONS)
+        return image_name
+    finally:
+        connections.close_all()
+
+
+def warm_pages(urls, concurrency, base_url=None):
+    """Запрашивает страницы; пары (адрес, статус).
+
+    С base_url запросы идут по HTTP к запущенным воркерам и прогревают их
+    кэши. Без него страницы рисуются в этом процессе, что прогревает
+    воркеры, только если бэкенд кэша общий.
+    """
+    if base_url is None:
+        get_page = render_page
+    else:
+        get_page = partial(fetch_page, base_url.rstrip('/'))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        yield from executor.map(get_page, urls)
+
+
+def warm_thumbnails(limit, concurrency):
+    """Создаёт миниатюры для картинок последних постов, если их ещё нет."""
+    images = Post.objects.exclude(image='').values_list(
+        'image', flat=True
+    )[:limit]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        yield from executor.map(make_thumbnail, list(images))
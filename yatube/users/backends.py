@@ -0,0 +1,46 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+from core.metrics import cache_result
+
+from yatube.settings import AUTH_USER_CACHE, AUTH_USER_CACHE_TIMEOUT
+
+
+def user_cache():
+    return caches[AUTH_USER_CACHE]
+
+
+def user_cache_key(user_id):
+    return f'auth_user:{user_id}'
+
+
+def forget_users(*user_ids):
+    """Сбрасывает кэш пользователей; нужен после QuerySet.update()."""
+    user_cache().delete_many([user_cache_key(pk) for pk in user_ids])
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кэша.
+
+    Запись сбрасывается сигналами при сохранении и удалении пользователя,
+    но только в кэше AUTH_USER_CACHE. Если он свой у каждого процесса
+    (LocMemCache), остальные процессы ещё до AUTH_USER_CACHE_TIMEOUT
+    секунд видят старую запись: отключённый пользователь или сессия
+    до смены пароля продолжают работать. Поэтому при нескольких
+    процессах AUTH_USER_CACHE должен быть общим (Redis, Memcached).
+    QuerySet.update() сигналов не шлёт — после него вызывайте
+    forget_users().
+    """
+
+    def get_user(self, user_id):
+        cache = user_cache()
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        cache_result('auth_user', hits=user is not None, misses=user is None)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, AUTH_USER_CACHE_TIMEOUT)
+        elif not self.user_can_authenticate(user):
+            return None
+        return user
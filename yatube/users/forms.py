@@ -1,5 +1,8 @@
 from django.contrib.auth import get_user_model
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
+from django.contrib.sites.shortcuts import get_current_site
+
+from .tasks import send_password_reset
 
 User = get_user_model()
 
@@ -8,3 +11,31 @@ class CreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """Письмо со ссылкой сброса пароля отправляет очередь emails.
+
+    В очередь ставится только id пользователя; токен создаёт воркер
+    стандартным default_token_generator. С TASKS_EAGER = False письма
+    уходят, только пока запущен run_workers.
+    """
+
+    def save(self, domain_override=None,
+             subject_template_name='registration/password_reset_subject.txt',
+             email_template_name='registration/password_reset_email.html',
+             use_https=False, token_generator=None, from_email=None,
+             request=None, html_email_template_name=None,
+             extra_email_context=None):
+        if domain_override:
+            site_name = domain = domain_override
+        else:
+            current_site = get_current_site(request)
+            site_name = current_site.name
+            domain = current_site.domain
+        for user in self.get_users(self.cleaned_data['email']):
+            send_password_reset.enqueue(
+                user.pk, domain, site_name, use_https, from_email,
+                subject_template_name, email_template_name,
+                html_email_template_name, extra_email_context
+            )
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.forms import PasswordResetForm
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from core.tasks import task
+
+User = get_user_model()
+
+
+@task(queue='emails')
+def send_password_reset(user_id, domain, site_name, use_https, from_email,
+                        subject_template_name, email_template_name,
+                        html_email_template_name=None,
+                        extra_email_context=None):
+    """Письмо со ссылкой сброса пароля.
+
+    Токен и ссылку собирает воркер: в очереди лежит только id
+    пользователя, а не готовое письмо.
+    """
+    user = User.objects.filter(pk=user_id, is_active=True).first()
+    if user is None or not user.has_usable_password():
+        return
+    context = {
+        'email': user.email,
+        'domain': domain,
+        'site_name': site_name,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'user': user,
+        'token': default_token_generator.make_token(user),
+        'protocol': 'https' if use_https else 'http',
+        **(extra_email_context or {}),
+    }
+    PasswordResetForm().send_mail(
+        subject_template_name, email_template_name, context, from_email,
+        user.email, html_email_template_name=html_email_template_name
+    )
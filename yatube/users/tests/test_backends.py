@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.backends import CachedModelBackend, forget_users, user_cache_key
+
+User = get_user_model()
+
+
+class CachedModelBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='test-user')
+        self.backend = CachedModelBackend()
+
+    def test_user_is_served_from_cache(self):
+        self.backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.user.pk)
+        self.assertEqual(user, self.user)
+
+    def test_cache_is_invalidated_on_save(self):
+        self.backend.get_user(self.user.pk)
+        self.user.first_name = 'test-name'
+        self.user.save()
+        user = self.backend.get_user(self.user.pk)
+        self.assertEqual(user.first_name, 'test-name')
+
+    def test_forget_users_after_bulk_update(self):
+        self.backend.get_user(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        forget_users(self.user.pk)
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_inactive_cached_user_is_rejected(self):
+        self.backend.get_user(self.user.pk)
+        key = user_cache_key(self.user.pk)
+        cached_user = cache.get(key)
+        cached_user.is_active = False
+        cache.set(key, cached_user)
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.cached_db'
+    )
+    def test_logged_in_request_makes_no_auth_queries(self):
+        self.client.force_login(self.user)
+        url = reverse('about:author')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
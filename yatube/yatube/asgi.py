@@ -0,0 +1,26 @@
+"""
+ASGI config for yatube project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Django 2.2 has no native ASGI handler, so the WSGI application is served
+through ``core.asgi.WsgiToAsgi`` with a bounded pool of worker threads and
+a separate pool for server-sent event streams.
+
+Run it with any ASGI server, e.g. ``uvicorn yatube.asgi:application``.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+from django.conf import settings  # noqa: E402
+
+from core.asgi import WsgiToAsgi  # noqa: E402
+
+application = WsgiToAsgi(
+    get_wsgi_application(),
+    max_workers=settings.ASGI_MAX_THREADS,
+    max_streams=settings.POST_EVENTS_MAX_STREAMS
+)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -29,10 +30,17 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.memory.MemoryMiddleware',
+    'core.querybudget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ViewNameMiddleware',
+    'core.admission.AdmissionMiddleware',
+    'core.ratelimit.RateLimitMiddleware',
+    'core.pagecache.PageCacheMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -40,18 +48,27 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if not DEBUG:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.nav.nav',
             ],
         },
     },
@@ -59,6 +76,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+STARTUP_HEAVY_MODULES = ('PIL', 'PIL.Image', 'sorl.thumbnail.engines')
+
+ASGI_MAX_THREADS = 20
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -66,6 +87,17 @@ DATABASES = {
     }
 }
 
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# При нескольких процессах — только общий кэш: изменения пользователя
+# сбрасываются лишь в нём, а в кэше процесса живут до таймаута.
+AUTH_USER_CACHE = 'default'
+
+AUTH_USER_CACHE_TIMEOUT = 30
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -81,12 +113,37 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Страницы живут в своём кэше: их много, и в общем default они
+# вытесняли бы сессии и корзины ограничения частоты. При нескольких
+# процессах pages должен быть общим (Redis, Memcached): теги сбрасываются
+# только в кэше процесса, который изменил пост, а остальные отдают
+# удалённые и старые версии постов до PAGE_CACHE_TIMEOUT.
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+    'stale_pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'stale_pages',
+        'OPTIONS': {'MAX_ENTRIES': 500},
+    },
 }
 
+# Сессии кэшируются, только если кэш общий для процессов: выход или
+# flush() сбрасывает сессию лишь в кэше своего процесса, и с LocMemCache
+# остальные воркеры пускали бы по cookie до SESSION_COOKIE_AGE.
+SESSION_CACHE_ALIAS = 'default'
+
+if CACHES[SESSION_CACHE_ALIAS]['BACKEND'].endswith('LocMemCache'):
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 LANGUAGE_CODE = 'ru'
 
 TIME_ZONE = 'UTC'
@@ -102,6 +159,16 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+STATICFILES_STORAGE = 'core.staticfiles.CompressedManifestStaticFilesStorage'
+
+# Что сжимать при collectstatic; картинки и шрифты уже сжаты.
+STATIC_COMPRESS_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.txt', '.json', '.xml', '.ico', '.html'
+)
+
+# Кэширование файлов без хеша в имени, секунды.
+STATIC_MAX_AGE = 60
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -112,4 +179,202 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 PAGINATOR_COUNT = 10
 
+GROUP_SUMMARY_TIMEOUT = 300
+
+ADMIN_BATCH_SIZE = 500
+
+DELETE_BATCH_SIZE = 500
+
+ARCHIVE_AFTER_DAYS = 365
+
+ARCHIVE_BATCH_SIZE = 200
+
+POST_EVENTS_BROKER = 'posts.events.LocalBroker'
+
+POST_EVENTS_BUFFER = 1000
+
+POST_EVENTS_POLL_INTERVAL = 1
+
+POST_EVENTS_HEARTBEAT = 15
+
+POST_EVENTS_STREAM_DURATION = 300
+
+# Открытых потоков событий на процесс. Под WSGI каждый занимает поток
+# воркера, поэтому /events/ стоит обслуживать через yatube.asgi: там
+# для потоков отдельный пул такого же размера.
+POST_EVENTS_MAX_STREAMS = 100
+
+COMMENTS_WRITE_BEHIND = False
+
+COMMENTS_BATCH_SIZE = 20
+
+COMMENTS_FLUSH_INTERVAL = 0.5
+
+RATE_LIMIT_CACHE = 'default'
+
+RATE_LIMITS = {
+    'posts:post_create': '30/m',
+    'posts:add_comment': '30/m',
+    'posts:profile_follow': '30/m',
+    'posts:profile_unfollow': '30/m',
+    'users:signup': '10/m',
+}
+
+# View из RATE_LIMITS, которые меняют данные по GET-ссылке: для них
+# ограничиваются запросы любым методом.
+RATE_LIMIT_ANY_METHOD = (
+    'posts:profile_follow',
+    'posts:profile_unfollow',
+)
+
+QUERY_BUDGET_STRICT = False
+
+# Для вошедшего пользователя бюджет включает чтение сессии из базы.
+QUERY_BUDGETS = {
+    'posts:index': 2,
+    'posts:group_index': 3,
+    'posts:group_list': 4,
+    'posts:profile': 6,
+    'posts:post_detail': 5,
+    'posts:post_edit': 3,
+    'posts:post_create': 2,
+    'posts:add_comment': 3,
+    'posts:follow_index': 3,
+    'posts:post_events': 1,
+    'posts:profile_follow': 3,
+    'posts:profile_unfollow': 3,
+}
+
+# Порог в секундах; None отключает журнал медленных запросов.
+SLOW_QUERY_THRESHOLD = 0.1
+
+SLOW_QUERY_LOG = os.environ.get(
+    'SLOW_QUERY_LOG',
+    os.path.join(tempfile.gettempdir(), 'yatube', 'slow_queries.jsonl')
+)
+
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+SLOW_QUERY_LOG_BACKUPS = 5
+
+# Каждый процесс пишет метрики в свой файл; каталог очищается при выкладке.
+METRICS_DIR = os.environ.get(
+    'METRICS_DIR', os.path.join(tempfile.gettempdir(), 'yatube_metrics')
+)
+
+# Токен для сборщика метрик; без него /metrics доступен только staff.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Частота выборки стеков в Гц для /debug/profile и sample_profile.
+PROFILER_RATE = 100
+
+PROFILER_MAX_RATE = 1000
+
+PROFILER_MAX_SECONDS = 60
+
+# Токен для sample_profile; без него /debug/profile доступен только staff.
+PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN', '')
+
+# tracemalloc замедляет выделение памяти; включать для поиска утечек.
+MEMORY_TRACKING = os.environ.get('MEMORY_TRACKING') == '1'
+
+MEMORY_TRACE_FRAMES = 10
+
+MEMORY_SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), 'yatube_memory')
+
+THUMBNAIL_ENGINE = 'core.thumbnails.Engine'
+
+# Число потоков run_workers на каждую очередь фоновых задач.
+TASK_QUEUES = {
+    'default': 2,
+    'thumbnails': 2,
+    'emails': 1,
+}
+
+# По умолчанию задачи выполняются сразу при постановке, и письма сброса
+# пароля уходят и без run_workers. TASKS_EAGER=0 в окружении включает
+# очередь; тогда нужен запущенный run_workers.
+TASKS_EAGER = os.environ.get('TASKS_EAGER', '1') == '1'
+
+TASK_RETRY_DELAY = 5
+
+TASK_TIMEOUT = 300
+
+TASK_POLL_INTERVAL = 1
+
+# Сколько дней хранятся завершённые задачи; их чистит purge_tasks.
+TASK_RETENTION_DAYS = 7
+
+# Периодические задачи run_scheduler и их интервалы в секундах.
+SCHEDULED_JOBS = {
+    'sqlite_analyze': 24 * 60 * 60,
+    'sqlite_vacuum': 24 * 60 * 60,
+    'clear_sessions': 60 * 60,
+    'purge_tasks': 24 * 60 * 60,
+    'prune_thumbnails': 24 * 60 * 60,
+    'archive_old_posts': 24 * 60 * 60,
+}
+
+SCHEDULER_TICK = 30
+
+SCHEDULER_LOCK_TIMEOUT = 60 * 60
+
+SQLITE_VACUUM_PAGES = 1000
+
+# Алиас из CACHES; с LocMemCache годится только для одного процесса.
+PAGE_CACHE = 'pages'
+
+PAGE_CACHE_TIMEOUT = 5 * 60
+
+# Страницы, которые кэшируются для запросов без cookie сессии.
+PAGE_CACHE_VIEWS = (
+    'posts:index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+)
+
+# Страницы, где от пользователя зависят только фрагменты {% hole %}:
+# их кэшированная копия отдаётся и вошедшим пользователям.
+PAGE_CACHE_SHARED_VIEWS = (
+    'posts:index',
+    'posts:group_list',
+)
+
+# Последняя удачная версия страницы отдаётся при ошибках базы; хранится
+# в своём кэше, чтобы не вытеснять свежие страницы.
+STALE_PAGE_CACHE = 'stale_pages'
+
+STALE_PAGE_TIMEOUT = 24 * 60 * 60
+
+STALE_REFRESH_INTERVAL = 5
+
+# Сколько секунд одинаковые запросы ждут страницу, которую рисует первый.
+# Между процессами запросы объединяются, только если кэш pages общий.
+SINGLE_FLIGHT_TIMEOUT = 5
+
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# Класс запроса для допуска: изменяющие методы (POST и др.) — write,
+# остальные — read. Здесь можно переопределить класс для имени view.
+ADMISSION_CLASSES = {}
+
+# Одновременных запросов каждого класса в одном процессе.
+ADMISSION_LIMITS = {
+    'read': 40,
+    'write': 8,
+}
+
+# Средняя задержка запроса к базе в секундах, выше которой сбрасываются
+# записи, а чтение получает устаревшие страницы.
+ADMISSION_DB_LATENCY = 0.25
+
+ADMISSION_WINDOW = 10
+
+ADMISSION_RETRY_AFTER = 5
+
+# Насколько старую копию страницы можно отдать вместо чтения при
+# перегрузке, секунды: устаревшая копия может показывать удалённые посты.
+ADMISSION_STALE_MAX_AGE = 60
+
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
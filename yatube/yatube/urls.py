@@ -1,7 +1,11 @@
+import re
+
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from core.views import memory, metrics, profiler, static_file
 
 handler404 = 'core.views.page_not_found'
 handler403 = 'core.views.permission_denied'
@@ -9,6 +13,14 @@ handler500 = 'core.views.server_error'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
+    path('debug/profile', profiler, name='profiler'),
+    path('debug/memory', memory, name='memory'),
+    re_path(
+        r'^%s(?P<path>.*)$' % re.escape(settings.STATIC_URL.lstrip('/')),
+        static_file,
+        name='static'
+    ),
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),
     path('', include('posts.urls', namespace='posts')),